@@ -1,45 +1,180 @@
 """The RTE Jours Signalés integration."""
 from __future__ import annotations
 
+import datetime
 import logging
+from typing import TYPE_CHECKING
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
-from homeassistant.core import HomeAssistant
+from .const import (
+    CONFIG_CLIEND_SECRET,
+    CONFIG_CLIENT_ID,
+    DATA_EVENT_SCHEDULERS,
+    DATA_EXPORT_VIEW,
+    DATA_EXPORTS,
+    DATA_SEEDS,
+    DEFAULT_EVENT_LEAD_TIMES,
+    DEFAULT_MAX_DATA_AGE,
+    DOMAIN,
+    EVENT_PROFILE,
+    OPTION_EVENT_LEAD_TIMES,
+    OPTION_MAX_DATA_AGE,
+    OPTION_PROFILING,
+    OPTION_PROFILING_CPROFILE_CYCLES,
+    OPTION_SHARED_CACHE_PATH,
+    PROFILING_EVENT,
+    PROFILING_OFF,
+)
 
-from .api_worker import APIWorker
-from .const import CONFIG_CLIEND_SECRET, CONFIG_CLIENT_ID, DOMAIN
+# Home Assistant and the core dependencies (requests, OAuth2, file locks) are only
+# imported once Home Assistant sets an entry up: importing the core package, which
+# loads this one first, must not pull them in
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.const import Platform
+    from homeassistant.core import Event, HomeAssistant
 
-PLATFORMS: list[Platform] = [Platform.SENSOR]
+    from .core.worker import APIWorker
 
 _LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up rte-jours-signales from a config entry."""
-    # Create the serial reader thread and start it
+    from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+
+    from .core.client import RTEClient
+    from .core.shared_cache import SharedCache
+    from .core.worker import APIWorker
+    from .events import SignalEventScheduler
+    from .export import SignalExport, SignalExportView
+
+    # The HTTP export view serves every entry, register it with the first one
+    if not hass.data.get(DATA_EXPORT_VIEW):
+        hass.http.register_view(SignalExportView(hass))
+        hass.data[DATA_EXPORT_VIEW] = True
+    # Create the serial reader thread and start it, seeded by the config flow if any.
+    # The RTE client (token, connections and rate limit) is shared by the fetchers of
+    # the same application credentials
+    client_id = str(entry.data.get(CONFIG_CLIENT_ID))
+    client_secret = str(entry.data.get(CONFIG_CLIEND_SECRET))
+    shared_cache_path = entry.options.get(OPTION_SHARED_CACHE_PATH, "")
     api_worker = APIWorker(
-        client_id=str(entry.data.get(CONFIG_CLIENT_ID)),
-        client_secret=str(entry.data.get(CONFIG_CLIEND_SECRET)),
+        client_id=client_id,
+        client_secret=client_secret,
+        seed=hass.data.get(DATA_SEEDS, {}).pop(entry.unique_id, None),
+        client=RTEClient.acquire(client_id, client_secret),
+        shared_cache=SharedCache(shared_cache_path) if shared_cache_path else None,
     )
+    _apply_profiling(hass, entry, api_worker)
+    _apply_max_data_age(entry, api_worker)
     api_worker.start()
-    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, api_worker.signalstop)
+
+    async def async_stop_worker(event: Event) -> None:
+        await hass.async_add_executor_job(api_worker.shutdown, event.event_type)
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_stop_worker)
+    )
     # Add options callback
-    entry.async_on_unload(lambda: api_worker.signalstop("config_entry_unload"))
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+    # Render the HTTP exports now and on every signals change
+    signal_export = SignalExport(entry.entry_id, api_worker)
+    hass.data.setdefault(DATA_EXPORTS, {})[entry.entry_id] = signal_export
+    entry.async_on_unload(api_worker.register_listener(signal_export.refresh))
+    # Schedule the signal day events now and on every signals change
+    event_scheduler = SignalEventScheduler(
+        hass, entry.entry_id, api_worker, _get_lead_times(entry)
+    )
+    event_scheduler.async_update()
+    entry.async_on_unload(event_scheduler.async_cancel)
+    entry.async_on_unload(
+        api_worker.register_listener(lambda: hass.add_job(event_scheduler.async_update))
+    )
+    hass.data.setdefault(DATA_EVENT_SCHEDULERS, {})[entry.entry_id] = event_scheduler
     # Add the serial reader to HA and initialize sensors
     try:
         hass.data[DOMAIN][entry.entry_id] = api_worker
     except KeyError:
         hass.data[DOMAIN] = {}
         hass.data[DOMAIN][entry.entry_id] = api_worker
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    await hass.config_entries.async_forward_entry_setups(entry, _get_platforms())
     # main init done
     return True
 
 
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply the updated options to the running API worker."""
+    api_worker: APIWorker = hass.data[DOMAIN][entry.entry_id]
+    if entry.options.get(OPTION_SHARED_CACHE_PATH, "") != api_worker.shared_cache_path:
+        # The worker is built around its shared cache
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    _apply_profiling(hass, entry, api_worker)
+    _apply_max_data_age(entry, api_worker)
+    hass.data[DATA_EVENT_SCHEDULERS][entry.entry_id].async_set_lead_times(
+        _get_lead_times(entry)
+    )
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        # Remove the related entry
-        hass.data[DOMAIN].pop(entry.entry_id)
+    if unload_ok := await hass.config_entries.async_unload_platforms(entry, _get_platforms()):
+        # Remove the related entry and make sure its worker is gone before any reload
+        api_worker: APIWorker = hass.data[DOMAIN].pop(entry.entry_id)
+        hass.data[DATA_EXPORTS].pop(entry.entry_id, None)
+        hass.data[DATA_EVENT_SCHEDULERS].pop(entry.entry_id, None)
+        await hass.async_add_executor_job(api_worker.shutdown, "config_entry_unload")
+        if api_worker.is_alive():
+            # Fail the unload so that a reload does not start a second worker
+            _LOGGER.error("Entry %s not unloaded: its API worker did not stop", entry.entry_id)
+            return False
     return unload_ok
+
+
+def _get_platforms() -> list[Platform]:
+    """Return the platforms of the entity types the integration provides."""
+    from homeassistant.const import Platform
+
+    return [Platform.SENSOR]
+
+
+def _get_lead_times(entry: ConfigEntry) -> list[int]:
+    """Return the start event lead times of the entry options, in minutes."""
+    from .events import parse_lead_times
+
+    return parse_lead_times(
+        entry.options.get(OPTION_EVENT_LEAD_TIMES, DEFAULT_EVENT_LEAD_TIMES)
+    )
+
+
+def _apply_max_data_age(entry: ConfigEntry, api_worker: APIWorker):
+    """Set the age past which the API worker signals are stale, 0 hours disabling it."""
+    max_data_age = entry.options.get(OPTION_MAX_DATA_AGE, DEFAULT_MAX_DATA_AGE)
+    api_worker.set_max_data_age(
+        datetime.timedelta(hours=max_data_age) if max_data_age else None
+    )
+
+
+def _apply_profiling(hass: HomeAssistant, entry: ConfigEntry, api_worker: APIWorker):
+    """Enable or disable the API worker profiling depending on the entry options."""
+    from .core.profiling import CycleProfiler, log_emitter
+
+    mode = entry.options.get(OPTION_PROFILING, PROFILING_OFF)
+    if mode == PROFILING_OFF:
+        api_worker.set_profiler(None)
+        return
+    if mode == PROFILING_EVENT:
+
+        def emit(record):
+            hass.bus.fire(EVENT_PROFILE, {"entry_id": entry.entry_id, **record})
+
+    else:
+        emit = log_emitter
+    _LOGGER.info("Profiling API worker cycles (%s)", mode)
+    api_worker.set_profiler(
+        CycleProfiler(
+            emit,
+            cprofile_cycles=entry.options.get(OPTION_PROFILING_CPROFILE_CYCLES, 0),
+            cprofile_path=hass.config.path(f"{DOMAIN}_{entry.entry_id}.prof"),
+        )
+    )
@@ -1,7 +1,9 @@
 """Config flow for RTE Jours Signalés integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
 from typing import Any
 
 from oauthlib.oauth2.rfc6749.errors import OAuth2Error
@@ -9,10 +11,30 @@ from requests.exceptions import RequestException
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.data_entry_flow import FlowResult
+from homeassistant.core import callback
+from homeassistant.data_entry_flow import AbortFlow, FlowResult
 
-from .api_worker import BadRequest, ServerError, UnexpectedError, application_tester
-from .const import CONFIG_CLIEND_SECRET, CONFIG_CLIENT_ID, DOMAIN
+from .core.client import BadRequest, ServerError, UnexpectedError
+from .core.worker import application_tester
+from .events import parse_lead_times
+from .const import (
+    API_REQ_TIMEOUT,
+    CONFIG_CLIEND_SECRET,
+    CONFIG_CLIENT_ID,
+    CONFIG_VALIDATION_TIMEOUT,
+    DATA_SEEDS,
+    DEFAULT_EVENT_LEAD_TIMES,
+    DEFAULT_MAX_DATA_AGE,
+    DOMAIN,
+    OPTION_EVENT_LEAD_TIMES,
+    OPTION_MAX_DATA_AGE,
+    OPTION_PROFILING,
+    OPTION_PROFILING_CPROFILE_CYCLES,
+    OPTION_SHARED_CACHE_PATH,
+    PROFILING_EVENT,
+    PROFILING_LOG,
+    PROFILING_OFF,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,6 +52,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return OptionsFlow(config_entry)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -39,16 +69,32 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             return self.async_show_form(
                 step_id="user", data_schema=STEP_USER_DATA_SCHEMA
             )
-        # Validate input
-        await self.async_set_unique_id(f"{DOMAIN}_{user_input[CONFIG_CLIENT_ID]}")
-        self._abort_if_unique_id_configured()
+        # Validate input, testing the credentials while checking for duplicates.
+        # The requests share the validation timeout, bounding the executor job itself.
+        validation = self.hass.async_add_executor_job(
+            application_tester,
+            str(user_input[CONFIG_CLIENT_ID]),
+            str(user_input[CONFIG_CLIEND_SECRET]),
+            CONFIG_VALIDATION_TIMEOUT,
+        )
+        try:
+            await self.async_set_unique_id(f"{DOMAIN}_{user_input[CONFIG_CLIENT_ID]}")
+            self._abort_if_unique_id_configured()
+        except AbortFlow:
+            # Only stops waiting: the running job ends within its own timeout
+            validation.cancel()
+            raise
         errors = {}
         try:
-            client_id = user_input[CONFIG_CLIENT_ID]
-            client_secret = user_input[CONFIG_CLIEND_SECRET]
-            await self.hass.async_add_executor_job(
-                lambda: application_tester(str(client_id), str(client_secret))
+            # Backstop in case a request outlives its socket timeouts
+            async with asyncio.timeout(CONFIG_VALIDATION_TIMEOUT + API_REQ_TIMEOUT):
+                seed = await validation
+        except TimeoutError:
+            _LOGGER.error(
+                "Application validation failed: no answer within %ss",
+                CONFIG_VALIDATION_TIMEOUT + API_REQ_TIMEOUT,
             )
+            errors["base"] = "timeout"
         except RequestException as request_exception:
             _LOGGER.error(
                 "Application validation failed: network error: %s", request_exception
@@ -71,6 +117,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             )
             errors["base"] = "http_unexpected_error"
         else:
+            # Hand the validation results over to the entry setup
+            self.hass.data.setdefault(DATA_SEEDS, {})[self.unique_id] = seed
             return self.async_create_entry(
                 title="Client ID: "+user_input[CONFIG_CLIENT_ID], data=user_input
             )
@@ -78,3 +126,69 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return self.async_show_form(
             step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
         )
+
+
+class OptionsFlow(config_entries.OptionsFlow):
+    """Handle the options flow for RTE Jours Signalés integration."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle the options step."""
+        errors = {}
+        if user_input is not None:
+            try:
+                parse_lead_times(user_input[OPTION_EVENT_LEAD_TIMES])
+            except ValueError:
+                errors[OPTION_EVENT_LEAD_TIMES] = "invalid_lead_times"
+            shared_cache_path = user_input.get(OPTION_SHARED_CACHE_PATH, "")
+            if shared_cache_path and not await self.hass.async_add_executor_job(
+                _is_writable_file_path, shared_cache_path
+            ):
+                errors[OPTION_SHARED_CACHE_PATH] = "invalid_shared_cache_path"
+            if not errors:
+                return self.async_create_entry(title="", data=user_input)
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        OPTION_PROFILING,
+                        default=options.get(OPTION_PROFILING, PROFILING_OFF),
+                    ): vol.In([PROFILING_OFF, PROFILING_LOG, PROFILING_EVENT]),
+                    vol.Required(
+                        OPTION_PROFILING_CPROFILE_CYCLES,
+                        default=options.get(OPTION_PROFILING_CPROFILE_CYCLES, 0),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1000)),
+                    vol.Optional(
+                        OPTION_SHARED_CACHE_PATH,
+                        default=options.get(OPTION_SHARED_CACHE_PATH, ""),
+                    ): str,
+                    vol.Required(
+                        OPTION_EVENT_LEAD_TIMES,
+                        default=options.get(OPTION_EVENT_LEAD_TIMES, DEFAULT_EVENT_LEAD_TIMES),
+                    ): str,
+                    vol.Required(
+                        OPTION_MAX_DATA_AGE,
+                        default=options.get(OPTION_MAX_DATA_AGE, DEFAULT_MAX_DATA_AGE),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=720)),
+                }
+            ),
+            errors=errors,
+        )
+
+
+def _is_writable_file_path(path: str) -> bool:
+    """Tell if path is absolute, in an existing directory this process can write to."""
+    directory = os.path.dirname(path)
+    return (
+        os.path.isabs(path)
+        and not os.path.isdir(path)
+        and os.path.isdir(directory)
+        and os.access(directory, os.W_OK | os.X_OK)
+    )
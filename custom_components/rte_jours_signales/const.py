@@ -6,6 +6,39 @@ DOMAIN = "rte_jours_signales"
 # Config Flow
 CONFIG_CLIENT_ID = "client_id"
 CONFIG_CLIEND_SECRET = "client_secret"
+CONFIG_VALIDATION_TIMEOUT = 10
+DATA_SEEDS = f"{DOMAIN}_seeds"
+SEED_MAX_AGE = 60
+
+# HTTP export
+DATA_EXPORTS = f"{DOMAIN}_exports"
+DATA_EXPORT_VIEW = f"{DOMAIN}_export_view"
+EXPORT_FORMAT_JSON = "json"
+EXPORT_FORMAT_ICS = "ics"
+
+# Signal day events
+DATA_EVENT_SCHEDULERS = f"{DOMAIN}_event_schedulers"
+
+# Options Flow
+OPTION_PROFILING = "profiling"
+OPTION_PROFILING_CPROFILE_CYCLES = "profiling_cprofile_cycles"
+PROFILING_OFF = "off"
+PROFILING_LOG = "log"
+PROFILING_EVENT = "event"
+OPTION_SHARED_CACHE_PATH = "shared_cache_path"
+OPTION_EVENT_LEAD_TIMES = "event_lead_times"
+DEFAULT_EVENT_LEAD_TIMES = "0"
+OPTION_MAX_DATA_AGE = "max_data_age"
+DEFAULT_MAX_DATA_AGE = 24
+
+# Shared cache
+SHARED_CACHE_POLL = 60
+SHARED_CACHE_LEASE_GRACE = 300
+
+# Events
+EVENT_PROFILE = f"{DOMAIN}_profile"
+EVENT_SIGNAL_START = f"{DOMAIN}_signal_start"
+EVENT_SIGNAL_END = f"{DOMAIN}_signal_end"
 
 # Service Device
 DEVICE_NAME = "RTE Jours Signalés"
@@ -25,9 +58,12 @@ API_DOMAIN = "digital.iservices.rte-france.com"
 API_TOKEN_ENDPOINT = f"https://{API_DOMAIN}/token/oauth"
 API_DEMAND_RESPONSE_SIGNAL_ENDPOINT = f"https://{API_DOMAIN}/open_api/demand_response_signal/v2/signals"
 API_REQ_TIMEOUT = 3
-API_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
+API_MIN_REQUEST_INTERVAL = 1
+API_WORKER_STOP_TIMEOUT = 5
 API_KEY_ERROR = "error"
 API_KEY_ERROR_DESC = "error_description"
+API_KEY_SIGNALS = "signals"
+API_KEY_SIGNALED_DATES = "signaled_dates"
 API_KEY_START = "start_date"
 API_KEY_END = "end_date"
 API_KEY_VALUE = "aoe_signals"
@@ -36,6 +72,18 @@ API_VALUE_SIGNAL_NOT_REPORTED = 0
 API_VALUE_SIGNAL_EXPLICIT = 1
 API_VALUE_SIGNAL_IMPLICIT = 2
 API_VALUE_SIGNAL_EXPLICIT_IMPLICIT = 3
+API_VALUES_SIGNAL = frozenset(
+    {
+        API_VALUE_SIGNAL_NOT_REPORTED,
+        API_VALUE_SIGNAL_EXPLICIT,
+        API_VALUE_SIGNAL_IMPLICIT,
+        API_VALUE_SIGNAL_EXPLICIT_IMPLICIT,
+    }
+)
+API_MAX_PAYLOAD_SIZE = 256 * 1024
+API_MAX_SIGNALS = 16
+API_MAX_SIGNAL_DAYS = 400
+API_MAX_LOGGED_ERRORS = 10
 
 API_ATTRIBUTION = "Données fournies par data.rte-france.com"
 USER_AGENT = "github.com/hiteule/rte-jours-signales v1.0.0"
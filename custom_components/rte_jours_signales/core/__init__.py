@@ -0,0 +1,4 @@
+"""Core of the RTE Jours Signalés integration: RTE client, signals parser and index, fetch scheduler.
+
+It does not depend on Home Assistant, so that it can run in batch jobs (see __main__.py).
+"""
@@ -0,0 +1,226 @@
+"""Command line access to the RTE Jours Signalés core, without Home Assistant.
+
+    python -m custom_components.rte_jours_signales.core fetch > payload.json
+    python -m custom_components.rte_jours_signales.core dump payload.json
+    python -m custom_components.rte_jours_signales.core replay payload.json --at 2025-01-01T11:00
+    python -m custom_components.rte_jours_signales.core bench payload.json
+
+fetch reads the application credentials from the RTE_CLIENT_ID and RTE_CLIENT_SECRET
+environment variables.
+"""
+from __future__ import annotations
+
+import argparse
+from collections.abc import Sequence
+import datetime
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from typing import Any
+
+from ..const import API_DEMAND_RESPONSE_SIGNAL_ENDPOINT, FRANCE_TZ, USER_AGENT
+from .signals import (
+    PayloadError,
+    SignalDay,
+    SignalIndex,
+    decode_signals_payload,
+    validate_signals_payload,
+)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run a command, returning the process exit code."""
+    parser = argparse.ArgumentParser(
+        prog="python -m custom_components.rte_jours_signales.core",
+        description="RTE Demand Response Signal API client, parser and scheduler.",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="log debug messages")
+    commands = parser.add_subparsers(dest="command", required=True)
+    fetch = commands.add_parser("fetch", help="fetch the signals payload")
+    fetch.add_argument("-o", "--output", help="write the payload to a file, not stdout")
+    dump = commands.add_parser("dump", help="validate a saved payload and print its days")
+    dump.add_argument("payload", help="saved signals payload")
+    replay = commands.add_parser(
+        "replay", help="run a worker cycle on a saved payload and print its outcome"
+    )
+    replay.add_argument("payload", help="saved signals payload")
+    replay.add_argument(
+        "--at", help="ISO datetime of the cycle, France local time if naive (default: now)"
+    )
+    bench = commands.add_parser("bench", help="time the decoding and parsing of a payload")
+    bench.add_argument("payload", help="saved signals payload")
+    bench.add_argument("-n", "--iterations", type=int, default=1000)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+    try:
+        if args.command == "fetch":
+            return _fetch(args.output)
+        with open(args.payload, "rb") as payload_file:
+            content = payload_file.read()
+        if args.command == "dump":
+            return _dump(content)
+        if args.command == "replay":
+            return _replay(content, args.at)
+        return _bench(content, args.iterations)
+    except (OSError, PayloadError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+
+def _fetch(output: str | None) -> int:
+    # The client pulls requests and oauthlib in, which the other commands do not need
+    from oauthlib.oauth2.rfc6749.errors import OAuth2Error
+    import requests
+
+    from .client import BadRequest, RTEClient, ServerError, UnexpectedError, handle_api_errors
+
+    try:
+        client_id, client_secret = os.environ["RTE_CLIENT_ID"], os.environ["RTE_CLIENT_SECRET"]
+    except KeyError as exc:
+        print(f"error: {exc.args[0]} is not set", file=sys.stderr)
+        return 1
+    client = RTEClient(client_id, client_secret, min_interval=0)
+    try:
+        client.fetch_token()
+        response = client.get(
+            API_DEMAND_RESPONSE_SIGNAL_ENDPOINT,
+            headers={"Accept": "application/json", "User-Agent": USER_AGENT},
+        )
+        handle_api_errors(response)
+    except (
+        BadRequest,
+        ServerError,
+        UnexpectedError,
+        OAuth2Error,
+        requests.exceptions.RequestException,
+    ) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        client.release()
+    if output is None:
+        sys.stdout.buffer.write(response.content)
+    else:
+        with open(output, "wb") as output_file:
+            output_file.write(response.content)
+    return 0
+
+
+def _dump(content: bytes) -> int:
+    validation = validate_signals_payload(decode_signals_payload(content))
+    _print_json(
+        {
+            "signals": {
+                str(signal_id): [_signal_day(signal_day) for signal_day in signal_index.Days]
+                for signal_id, signal_index in validation.Signals.items()
+            },
+            "errors": list(validation.Errors),
+        }
+    )
+    return 0
+
+
+def _replay(content: bytes, at: str | None) -> int:
+    from .client import RTEClient
+    from .worker import APIWorker
+
+    localized_now = datetime.datetime.now(FRANCE_TZ)
+    if at is not None:
+        localized_now = datetime.datetime.fromisoformat(at)
+        if localized_now.tzinfo is None:
+            localized_now = localized_now.replace(tzinfo=FRANCE_TZ)
+    api_worker = APIWorker(
+        "replay",
+        "replay",
+        clock=lambda: localized_now,
+        client=RTEClient("replay", "replay", session=_ReplaySession(content), min_interval=0),
+    )
+    # One cycle, as run by the worker thread, against the saved payload
+    wait_time = api_worker._run_cycle()
+    api_worker.shutdown("replay")
+    signals: dict[int, SignalIndex] = api_worker.get_signals()
+    _print_json(
+        {
+            "at": localized_now.isoformat(),
+            "signals": {
+                str(signal_id): {
+                    "current": _signal_day(signal_index.current(localized_now)),
+                    "next": _signal_day(signal_index.next(localized_now)),
+                }
+                for signal_id, signal_index in signals.items()
+            },
+            "wait": wait_time.total_seconds(),
+            "next_fetch": (localized_now + wait_time).isoformat(),
+        }
+    )
+    return 0
+
+
+def _bench(content: bytes, iterations: int) -> int:
+    decode_times: list[float] = []
+    validate_times: list[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        payload = decode_signals_payload(content)
+        decoded = time.perf_counter()
+        validate_signals_payload(payload)
+        decode_times.append(decoded - start)
+        validate_times.append(time.perf_counter() - decoded)
+    _print_json(
+        {
+            "iterations": iterations,
+            "bytes": len(content),
+            "decode_us": _stats(decode_times),
+            "validate_us": _stats(validate_times),
+        }
+    )
+    return 0
+
+
+class _ReplaySession:
+    """OAuth2 session stand-in answering every request with a saved payload."""
+
+    def __init__(self, content: bytes) -> None:
+        self.token = {"access_token": "replay", "token_type": "Bearer"}
+        self._content = content
+
+    def get(self, url: str, **kwargs):
+        import requests
+
+        response = requests.Response()
+        response.status_code = 200
+        response._content = self._content
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def _signal_day(signal_day: SignalDay | None) -> dict[str, Any] | None:
+    if signal_day is None:
+        return None
+    return {
+        "start": signal_day.Start.isoformat(),
+        "end": signal_day.End.isoformat(),
+        "value": signal_day.Value,
+        "updated": signal_day.Updated.isoformat(),
+    }
+
+
+def _stats(durations: list[float]) -> dict[str, float]:
+    return {
+        "mean": round(statistics.fmean(durations) * 1e6, 1),
+        "median": round(statistics.median(durations) * 1e6, 1),
+        "min": round(min(durations) * 1e6, 1),
+    }
+
+
+def _print_json(content: Any) -> None:
+    print(json.dumps(content, indent=2))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,350 @@
+"""RTE open API client shared by every fetcher using the same application credentials."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+import contextlib
+import logging
+import socket
+import threading
+import time
+from typing import Any, ClassVar
+import weakref
+
+from oauthlib.oauth2 import BackendApplicationClient, TokenExpiredError
+import requests
+from requests.adapters import HTTPAdapter
+from requests.auth import HTTPBasicAuth
+from requests_oauthlib import OAuth2Session
+
+from ..const import (
+    API_KEY_ERROR,
+    API_KEY_ERROR_DESC,
+    API_MIN_REQUEST_INTERVAL,
+    API_REQ_TIMEOUT,
+    API_TOKEN_ENDPOINT,
+    USER_AGENT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RTEClient:
+    """OAuth2 client of the RTE open APIs.
+
+    Its fetchers, each on its own schedule, share one access token, one keep-alive
+    connection pool and one rate limiter. Use acquire to share the client of an
+    application with the other fetchers of the process, and release once done.
+
+    A fetcher passing its stop event as interrupt can abort its own in-flight requests
+    with abort, once the event is set, without disturbing the other fetchers.
+    """
+
+    _registry: ClassVar[dict[tuple[str, str], RTEClient]] = {}
+    _registry_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        *,
+        session: OAuth2Session | None = None,
+        min_interval: float = API_MIN_REQUEST_INTERVAL,
+    ) -> None:
+        """Initialize a client, only used by its creator until released.
+
+        The OAuth2 session can be injected to run against a simulated API.
+        """
+        self._key = (client_id, client_secret)
+        self._auth = HTTPBasicAuth(client_id, client_secret)
+        self._adapter = InterruptibleAdapter()
+        if session is None:
+            session = OAuth2Session(client=BackendApplicationClient(client_id=client_id))
+            session.mount("https://", self._adapter)
+            session.mount("http://", self._adapter)
+        self._session = session
+        self._token_lock = threading.Lock()
+        self._rate_limiter = RateLimiter(min_interval)
+        self._released = threading.Event()
+        self._users = 1
+
+    @classmethod
+    def acquire(cls, client_id: str, client_secret: str) -> RTEClient:
+        """Return the shared client of an application, creating it if needed."""
+        with cls._registry_lock:
+            client = cls._registry.get((client_id, client_secret))
+            if client is None:
+                client = cls._registry[(client_id, client_secret)] = cls(
+                    client_id, client_secret
+                )
+            else:
+                client._users += 1
+            _LOGGER.debug("RTE client of %s used by %d fetchers", client_id, client._users)
+            return client
+
+    def release(self) -> None:
+        """Stop using the client, closing it once its last fetcher released it."""
+        with self._registry_lock:
+            self._users -= 1
+            if self._users > 0:
+                return
+            if self._registry.get(self._key) is self:
+                del self._registry[self._key]
+        self._released.set()
+        # Do not wait for the in-flight requests, if any, to time out
+        self._adapter.interrupt()
+        self._session.close()
+
+    def abort(self, interrupt: threading.Event) -> None:
+        """Abort the in-flight requests of the fetcher which passed this set interrupt."""
+        self._adapter.abort(interrupt)
+
+    @property
+    def token(self) -> dict[str, Any]:
+        """Return the current access token, empty if none was fetched yet."""
+        return self._session.token
+
+    def seed_token(self, token: dict[str, Any]) -> None:
+        """Use an access token fetched beforehand, unless the client already has one."""
+        with self._token_lock:
+            if not self._session.token:
+                self._session.token = token
+
+    def fetch_token(
+        self,
+        timeout: float = API_REQ_TIMEOUT,
+        expired: dict[str, Any] | None = None,
+        interrupt: threading.Event | None = None,
+    ) -> None:
+        """Fetch a new access token.
+
+        With expired, only fetch if another fetcher did not already replace that token.
+        """
+        with self._token_lock, self._adapter.interrupt_scope(interrupt):
+            if expired is not None and self._session.token is not expired:
+                return
+            _LOGGER.debug("Requesting access token")
+            self._session.fetch_token(
+                token_url=API_TOKEN_ENDPOINT,
+                auth=self._auth,
+                headers={"User-Agent": USER_AGENT},
+                timeout=timeout,
+            )
+
+    def get(
+        self,
+        url: str,
+        headers: dict[str, str],
+        timeout: float = API_REQ_TIMEOUT,
+        interrupt: threading.Event | None = None,
+    ) -> requests.Response:
+        """Request an API endpoint, within the rate limit and renewing an expired token."""
+        self._rate_limiter.wait(interrupt or self._released)
+        token = self._session.token
+        with self._adapter.interrupt_scope(interrupt):
+            try:
+                return self._session.get(url, timeout=timeout, headers=headers)
+            except TokenExpiredError:
+                self.fetch_token(timeout, expired=token, interrupt=interrupt)
+                return self._session.get(url, timeout=timeout, headers=headers)
+
+
+class RateLimiter:
+    """Space the requests of every thread by a minimal interval."""
+
+    def __init__(self, min_interval: float) -> None:
+        """Initialize the rate limiter."""
+        self._min_interval = min_interval
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self, interrupt: threading.Event) -> None:
+        """Block until the next request slot, or until interrupted."""
+        if self._min_interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self._min_interval
+        if slot > now:
+            interrupt.wait(slot - now)
+
+
+class InterruptibleAdapter(HTTPAdapter):
+    """HTTP adapter able to abort in-flight requests from another thread.
+
+    interrupt aborts every request. abort only aborts the requests sent within the
+    interrupt scope of an event, once set: the connections they use are recorded
+    under a lock which also checks the event, so none of them escapes.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        """Initialize the interruptible adapter."""
+        self._connections: weakref.WeakSet = weakref.WeakSet()
+        self._interrupted = False
+        self._scopes: dict[threading.Event, set] = {}
+        self._scopes_lock = threading.Lock()
+        self._local = threading.local()
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        """Initialize the pool manager, tracking each connection it opens or uses."""
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: _tracking_pool(pool_class, self._connections.add, self._track_request)
+            for scheme, pool_class in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+    @contextlib.contextmanager
+    def interrupt_scope(self, interrupt: threading.Event | None) -> Iterator[None]:
+        """Make the requests of the current thread abortable with interrupt, until exit."""
+        outer = getattr(self._local, "interrupt", None)
+        if interrupt is None or outer is not None:
+            yield
+            return
+        self._local.interrupt = interrupt
+        try:
+            yield
+        finally:
+            self._local.interrupt = None
+            with self._scopes_lock:
+                self._scopes.pop(interrupt, None)
+
+    def abort(self, interrupt: threading.Event) -> None:
+        """Abort the requests sent within the scope of interrupt, which must be set."""
+        with self._scopes_lock:
+            connections = list(self._scopes.get(interrupt, ()))
+        for connection in connections:
+            _shutdown(connection)
+
+    def send(self, request, *args, **kwargs) -> requests.Response:
+        """Send a request, unless the adapter has been interrupted."""
+        if self._interrupted:
+            raise requests.exceptions.ConnectionError("Adapter interrupted", request=request)
+        return super().send(request, *args, **kwargs)
+
+    def interrupt(self) -> None:
+        """Abort the in-flight requests and refuse new ones."""
+        self._interrupted = True
+        for connection in list(self._connections):
+            _shutdown(connection)
+
+    def _track_request(self, connection) -> None:
+        if (interrupt := getattr(self._local, "interrupt", None)) is None:
+            return
+        with self._scopes_lock:
+            if interrupt.is_set():
+                raise requests.exceptions.ConnectionError("Request interrupted")
+            self._scopes.setdefault(interrupt, set()).add(connection)
+
+
+def _tracking_pool(
+    pool_class: type, track: Callable[[Any], None], track_request: Callable[[Any], None]
+) -> type:
+    class TrackingConnection(pool_class.ConnectionCls):
+        def connect(self):
+            super().connect()
+            track(self)
+
+    def _make_request(self, connection, *args, **kwargs):
+        track_request(connection)
+        return pool_class._make_request(self, connection, *args, **kwargs)
+
+    return type(
+        pool_class.__name__,
+        (pool_class,),
+        {"ConnectionCls": TrackingConnection, "_make_request": _make_request},
+    )
+
+
+def _shutdown(connection) -> None:
+    # Shutting the socket down wakes up the thread blocked reading it
+    if (sock := getattr(connection, "sock", None)) is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+def handle_api_errors(response: requests.Response):
+    """Use to handle all errors described in the API documentation."""
+    if response.status_code == 400:
+        try:
+            payload = response.json()
+            raise BadRequest(
+                response.status_code,
+                f"{payload[API_KEY_ERROR]}: {payload[API_KEY_ERROR_DESC]}",
+            )
+        except requests.JSONDecodeError as exc:
+            raise BadRequest(
+                response.status_code, f"Failed to decode JSON payload: {response.text}"
+            ) from exc
+        except KeyError as exc:
+            raise BadRequest(
+                response.status_code,
+                f"Failed to decode access JSON error payload: {response.text}",
+            ) from exc
+    elif response.status_code == 401:
+        raise BadRequest(response.status_code, "Unauthorized")
+    elif response.status_code == 403:
+        raise BadRequest(response.status_code, "Forbidden")
+    elif response.status_code == 404:
+        raise BadRequest(response.status_code, "Not Found")
+    elif response.status_code == 408:
+        raise BadRequest(response.status_code, "Request Time-out")
+    elif response.status_code == 413:
+        raise BadRequest(response.status_code, "Request Entity Too Large")
+    elif response.status_code == 414:
+        raise BadRequest(response.status_code, "Request-URI Too Long")
+    elif response.status_code == 429:
+        raise BadRequest(response.status_code, "Too Many Requests")
+    elif response.status_code == 500:
+        try:
+            payload = response.json()
+            raise ServerError(
+                response.status_code,
+                f"{payload[API_KEY_ERROR]}: {payload[API_KEY_ERROR_DESC]}",
+            )
+        except requests.JSONDecodeError as exc:
+            raise ServerError(
+                response.status_code, f"Failed to decode JSON payload: {response.text}"
+            ) from exc
+        except KeyError as exc:
+            raise ServerError(
+                response.status_code,
+                f"Failed to decode access JSON error payload: {response.text}",
+            ) from exc
+    elif response.status_code == 503:
+        raise ServerError(response.status_code, "Service Unavailable")
+    elif response.status_code == 509:
+        raise ServerError(response.status_code, "Bandwidth Limit Exceeded")
+    elif response.status_code != 200:
+        raise UnexpectedError(
+            response.status_code, f"Unexpected HTTP code: {response.text}"
+        )
+
+
+class BadRequest(Exception):
+    """Represents a API HTTP 4xx error."""
+
+    def __init__(self, code: int, message: str) -> None:
+        """Initialize the BadRequest exception."""
+        self.code = code
+        super().__init__(f"HTTP code {code}: {message}")
+
+
+class ServerError(Exception):
+    """Represents a API HTTP 5xx error."""
+
+    def __init__(self, code: int, message: str) -> None:
+        """Initialize the ServerError exception."""
+        self.code = code
+        super().__init__(f"HTTP code {code}: {message}")
+
+
+class UnexpectedError(Exception):
+    """Represents any HTTP error not described by the API documentation."""
+
+    def __init__(self, code: int, message: str) -> None:
+        """Initialize the UnexpectedError exception."""
+        self.code = code
+        super().__init__(f"HTTP code {code}: {message}")
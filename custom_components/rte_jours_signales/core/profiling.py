@@ -0,0 +1,101 @@
+"""Opt-in profiling of the RTE Jours Signalés API worker cycles."""
+from __future__ import annotations
+
+from collections.abc import Callable
+import cProfile
+import functools
+import logging
+import time
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CycleProfiler:
+    """Time the stages of the API worker cycles and report them once per cycle."""
+
+    def __init__(
+        self,
+        emit: Callable[[dict[str, Any]], None],
+        cprofile_cycles: int = 0,
+        cprofile_path: str | None = None,
+    ) -> None:
+        """Initialize the cycle profiler."""
+        self._emit = emit
+        self._spans: dict[str, float] = {}
+        self._cycle = 0
+        # cProfile capture of the first N cycles
+        self._cprofile_remaining = cprofile_cycles if cprofile_path else 0
+        self._cprofile_path = cprofile_path
+        self._cprofile: cProfile.Profile | None = None
+
+    def wrap_stage(self, stage: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Return func timed as a span of the current cycle."""
+        spans = self._spans
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                spans[stage] = spans.get(stage, 0.0) + time.perf_counter() - start
+
+        return timed
+
+    def wrap_cycle(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Return func timed as a whole cycle, emitting its spans when done."""
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            self._spans.clear()
+            self._start_cprofile()
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                total = time.perf_counter() - start
+                self._stop_cprofile()
+                self._cycle += 1
+                self._emit(
+                    {
+                        "cycle": self._cycle,
+                        "total": total,
+                        "stages": dict(self._spans),
+                    }
+                )
+
+        return timed
+
+    def _start_cprofile(self) -> None:
+        # Must run within the profiled thread: cProfile only hooks the current one
+        if self._cprofile_remaining <= 0:
+            return
+        if self._cprofile is None:
+            self._cprofile = cProfile.Profile()
+        self._cprofile.enable()
+
+    def _stop_cprofile(self) -> None:
+        if self._cprofile is None or self._cprofile_remaining <= 0:
+            return
+        self._cprofile.disable()
+        self._cprofile_remaining -= 1
+        if self._cprofile_remaining == 0:
+            try:
+                self._cprofile.dump_stats(self._cprofile_path)
+            except OSError as os_error:
+                _LOGGER.error("Failed to write cProfile dump: %s", os_error)
+            else:
+                _LOGGER.info("cProfile dump written to %s", self._cprofile_path)
+            self._cprofile = None
+
+
+def log_emitter(record: dict[str, Any]) -> None:
+    """Emit a cycle profile as a structured log record."""
+    _LOGGER.info(
+        "Worker cycle %d took %.3fs: %s",
+        record["cycle"],
+        record["total"],
+        ", ".join(f"{stage}={duration:.3f}s" for stage, duration in record["stages"].items()),
+        extra={"rte_profile": record},
+    )
@@ -0,0 +1,145 @@
+"""Signals snapshot shared by the Home Assistant instances of a host."""
+from __future__ import annotations
+
+from collections.abc import Iterator
+import contextlib
+import datetime
+import fcntl
+import json
+import logging
+import os
+import socket
+import tempfile
+import time
+from typing import Any, NamedTuple
+import uuid
+
+from .signals import SignalDay, SignalIndex
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Snapshot(NamedTuple):
+    """Represents the signals fetched by the lease holder."""
+
+    Signals: dict[int, SignalIndex]
+    Fetched: datetime.datetime
+
+
+class SharedCache:
+    """Snapshot file written by the instance holding the fetch lease, read by the others.
+
+    The lease is a file naming its holder and expiry, only updated under an exclusive
+    lock of a companion lock file. Another instance takes the lease over once expired.
+    """
+
+    def __init__(self, path: str, owner: str | None = None) -> None:
+        """Initialize the shared cache."""
+        self.path = path
+        self._lock_path = f"{path}.lock"
+        self._lease_path = f"{path}.lease"
+        self._owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}"
+        self._read_stat: tuple[int, int] | None = None
+
+    def acquire(self, duration: datetime.timedelta) -> bool:
+        """Take or renew the fetch lease for duration, unless another instance holds it.
+
+        Raise OSError if the lock or lease file cannot be written.
+        """
+        now = time.time()
+        with self._locked():
+            try:
+                with open(self._lease_path, encoding="utf-8") as lease_file:
+                    lease = json.load(lease_file)
+            except (OSError, ValueError):
+                lease = None
+            if lease and lease.get("owner") != self._owner and lease.get("expires", 0) > now:
+                return False
+            if not lease or lease.get("owner") != self._owner:
+                _LOGGER.info("Taking the shared cache lease of %s", self.path)
+            _write_atomic(
+                self._lease_path,
+                {"owner": self._owner, "expires": now + duration.total_seconds()},
+            )
+        return True
+
+    def write(self, signals: dict[int, SignalIndex], fetched: datetime.datetime) -> None:
+        """Publish a snapshot of the signals to the other instances, raising OSError on failure."""
+        _write_atomic(
+            self.path,
+            {
+                "fetched": fetched.isoformat(),
+                "signals": {
+                    str(signal_id): [
+                        [
+                            signal_day.Start.isoformat(),
+                            signal_day.End.isoformat(),
+                            signal_day.Value,
+                            signal_day.Updated.isoformat(),
+                        ]
+                        for signal_day in signal_index.Days
+                    ]
+                    for signal_id, signal_index in signals.items()
+                },
+            },
+        )
+
+    def read(self) -> Snapshot | None:
+        """Return the snapshot if it changed since the last read, None otherwise."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        if (stat.st_mtime_ns, stat.st_size) == self._read_stat:
+            return None
+        try:
+            with open(self.path, encoding="utf-8") as snapshot_file:
+                snapshot = json.load(snapshot_file)
+            signals = {
+                int(signal_id): SignalIndex.from_days(
+                    [
+                        SignalDay(
+                            Start=datetime.datetime.fromisoformat(start),
+                            End=datetime.datetime.fromisoformat(end),
+                            Value=value,
+                            Updated=datetime.datetime.fromisoformat(updated),
+                        )
+                        for start, end, value, updated in signal_days
+                    ]
+                )
+                for signal_id, signal_days in snapshot["signals"].items()
+            }
+            fetched = datetime.datetime.fromisoformat(snapshot["fetched"])
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            _LOGGER.error("Failed to read shared cache %s: %s", self.path, exc)
+            return None
+        self._read_stat = (stat.st_mtime_ns, stat.st_size)
+        return Snapshot(Signals=signals, Fetched=fetched)
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        with open(self._lock_path, "a", encoding="utf-8") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _write_atomic(path: str, content: Any) -> None:
+    # Readers see either the previous or the new file, never a partial one
+    directory = os.path.dirname(path) or "."
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=directory, delete=False
+    ) as temp_file:
+        try:
+            json.dump(content, temp_file)
+        except BaseException:
+            temp_file.close()
+            os.unlink(temp_file.name)
+            raise
+    try:
+        os.replace(temp_file.name, path)
+    except OSError:
+        os.unlink(temp_file.name)
+        raise
@@ -0,0 +1,222 @@
+"""Parser, validator and index of the RTE Demand Response Signal API payloads."""
+from __future__ import annotations
+
+import bisect
+import datetime
+import functools
+import json
+import logging
+import re
+from typing import Any, NamedTuple
+
+from ..const import (
+    API_KEY_END,
+    API_KEY_SIGNALED_DATES,
+    API_KEY_SIGNALS,
+    API_KEY_START,
+    API_KEY_UPDATED,
+    API_KEY_VALUE,
+    API_MAX_LOGGED_ERRORS,
+    API_MAX_PAYLOAD_SIZE,
+    API_MAX_SIGNAL_DAYS,
+    API_MAX_SIGNALS,
+    API_VALUES_SIGNAL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# RTE API datetimes, such as 2025-01-01T00:00:00+01:00
+_RTE_DATETIME = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})([+-])(\d{2}):(\d{2})"
+)
+
+class SignalDay(NamedTuple):
+    """Represents a signal day."""
+
+    Start: datetime.datetime | datetime.date
+    End: datetime.datetime | datetime.date
+    Value: int
+    Updated: datetime.datetime
+
+class SignalIndex(NamedTuple):
+    """Represents the signal days of a signal, sorted by start date."""
+
+    Days: tuple[SignalDay, ...]
+    Starts: tuple[datetime.datetime, ...]
+    Updated: datetime.datetime | None
+
+    @classmethod
+    def from_days(cls, signal_days: list[SignalDay]) -> SignalIndex:
+        """Build the index of a signal days list, whatever its order."""
+        days = tuple(sorted(signal_days, key=lambda signal_day: signal_day.Start))
+        return cls(
+            Days=days,
+            Starts=tuple(signal_day.Start for signal_day in days),
+            Updated=max((signal_day.Updated for signal_day in days), default=None),
+        )
+
+    def current(self, localized_now: datetime.datetime) -> SignalDay | None:
+        """Return the signal day including the given datetime, if any."""
+        position = bisect.bisect_right(self.Starts, localized_now) - 1
+        if position >= 0 and localized_now < self.Days[position].End:
+            return self.Days[position]
+        return None
+
+    def next(self, localized_now: datetime.datetime) -> SignalDay | None:
+        """Return the first signal day starting after the given datetime, if any."""
+        position = bisect.bisect_right(self.Starts, localized_now)
+        if position < len(self.Days):
+            return self.Days[position]
+        return None
+
+    def newest(self) -> SignalDay | None:
+        """Return the signal day starting last, if any."""
+        return self.Days[-1] if self.Days else None
+
+class SignalsValidation(NamedTuple):
+    """Represents the valid signal days of a payload, and why the others were skipped."""
+
+    Signals: dict[int, SignalIndex]
+    Errors: tuple[str, ...]
+
+def decode_signals_payload(content: bytes) -> Any:
+    """Decode a signals API response body, rejecting oversized ones unread."""
+    if len(content) > API_MAX_PAYLOAD_SIZE:
+        raise PayloadError(f"payload of {len(content)} bytes exceeds {API_MAX_PAYLOAD_SIZE}")
+    try:
+        return json.loads(content)
+    except ValueError as exc:
+        raise PayloadError(f"invalid JSON: {exc}") from exc
+
+def parse_signal_days(payload: Any) -> dict[int, SignalIndex]:
+    """Parse the signal days of every signal of a signals API payload.
+
+    Signals carry no identifier in the API payload, so they are keyed by position:
+    should RTE reorder them, the entities of a position would follow the new signal.
+    Invalid days are skipped and reported by a single warning.
+    """
+    validation = validate_signals_payload(payload)
+    if validation.Errors:
+        _LOGGER.warning(
+            "Skipped %d invalid signal days: %s%s",
+            len(validation.Errors),
+            "; ".join(validation.Errors[:API_MAX_LOGGED_ERRORS]),
+            " (...)" if len(validation.Errors) > API_MAX_LOGGED_ERRORS else "",
+        )
+    return validation.Signals
+
+def validate_signals_payload(payload: Any) -> SignalsValidation:
+    """Validate a signals API payload in one pass and build its signal days.
+
+    The payload is rejected as a whole (PayloadError) when its structure is invalid or
+    too large. Days with missing or invalid fields, an unknown value, a start not before
+    their end or overlapping a previous day of their signal are skipped and reported.
+    Datetimes are only built once the whole payload passed the structure checks.
+    """
+    if not isinstance(payload, dict) or not isinstance(
+        signals := payload.get(API_KEY_SIGNALS), list
+    ):
+        raise PayloadError(f"no '{API_KEY_SIGNALS}' list")
+    if len(signals) > API_MAX_SIGNALS:
+        raise PayloadError(f"{len(signals)} signals exceed {API_MAX_SIGNALS}")
+    errors: list[str] = []
+    checked_signals: list[list[tuple]] = []
+    for signal_id, signal in enumerate(signals):
+        if not isinstance(signal, dict) or not isinstance(
+            signal_days := signal.get(API_KEY_SIGNALED_DATES), list
+        ):
+            raise PayloadError(f"signal {signal_id} has no '{API_KEY_SIGNALED_DATES}' list")
+        if len(signal_days) > API_MAX_SIGNAL_DAYS:
+            raise PayloadError(
+                f"signal {signal_id} has {len(signal_days)} days, exceeding {API_MAX_SIGNAL_DAYS}"
+            )
+        checked_days = []
+        for day_id, signal_day in enumerate(signal_days):
+            try:
+                if not isinstance(signal_day, dict):
+                    raise ValueError("not an object")
+                value = signal_day.get(API_KEY_VALUE)
+                # bool is an int subclass, so check the exact type
+                if type(value) is not int or value not in API_VALUES_SIGNAL:
+                    raise ValueError(f"unknown {API_KEY_VALUE} {value!r}")
+                start = _match_rte_api_datetime(signal_day, API_KEY_START)
+                end = _match_rte_api_datetime(signal_day, API_KEY_END)
+                updated = _match_rte_api_datetime(signal_day, API_KEY_UPDATED)
+                start_instant = _rte_api_instant(start)
+                end_instant = _rte_api_instant(end)
+                _rte_api_instant(updated)
+                if start_instant >= end_instant:
+                    raise ValueError(f"{API_KEY_START} not before {API_KEY_END}")
+            except ValueError as exc:
+                errors.append(f"signal {signal_id} day {day_id}: {exc}")
+                continue
+            checked_days.append((start_instant, end_instant, value, start, end, updated))
+        # Sorted by start, a day overlaps when starting before the previous kept end
+        checked_days.sort(key=lambda checked_day: checked_day[0])
+        kept_days = []
+        for checked_day in checked_days:
+            if kept_days and checked_day[0] < kept_days[-1][1]:
+                errors.append(
+                    f"signal {signal_id} day {checked_day[3].group()} overlaps "
+                    f"day {kept_days[-1][3].group()}"
+                )
+                continue
+            kept_days.append(checked_day)
+        checked_signals.append(kept_days)
+    return SignalsValidation(
+        Signals={
+            signal_id: SignalIndex.from_days(
+                [
+                    SignalDay(
+                        Start=_build_rte_api_datetime(start),
+                        End=_build_rte_api_datetime(end),
+                        Value=value,
+                        Updated=_build_rte_api_datetime(updated),
+                    )
+                    for _, _, value, start, end, updated in kept_days
+                ]
+            )
+            for signal_id, kept_days in enumerate(checked_signals)
+        },
+        Errors=tuple(errors),
+    )
+
+def _match_rte_api_datetime(signal_day: dict[str, Any], key: str) -> re.Match:
+    date = signal_day.get(key)
+    if not isinstance(date, str) or (match := _RTE_DATETIME.fullmatch(date)) is None:
+        raise ValueError(f"invalid {key} {date!r}")
+    return match
+
+def _rte_api_instant(match: re.Match) -> int:
+    # Seconds since the proleptic Gregorian origin, to compare instants cheaply
+    year, month, day, hour, minute, second, sign, offset_hour, offset_minute = match.groups()
+    if int(hour) > 23 or int(minute) > 59 or int(second) > 59:
+        raise ValueError(f"invalid time {match.group()!r}")
+    offset = int(offset_hour) * 3600 + int(offset_minute) * 60
+    return (
+        datetime.date(int(year), int(month), int(day)).toordinal() * 86400
+        + int(hour) * 3600
+        + int(minute) * 60
+        + int(second)
+        - (offset if sign == "+" else -offset)
+    )
+
+def _build_rte_api_datetime(match: re.Match) -> datetime.datetime:
+    year, month, day, hour, minute, second, sign, offset_hour, offset_minute = match.groups()
+    return datetime.datetime(
+        int(year),
+        int(month),
+        int(day),
+        int(hour),
+        int(minute),
+        int(second),
+        tzinfo=_rte_api_timezone(sign, offset_hour, offset_minute),
+    )
+
+@functools.lru_cache(maxsize=8)
+def _rte_api_timezone(sign: str, hours: str, minutes: str) -> datetime.timezone:
+    offset = datetime.timedelta(hours=int(hours), minutes=int(minutes))
+    return datetime.timezone(offset if sign == "+" else -offset)
+
+class PayloadError(Exception):
+    """Represents a signals API payload rejected as a whole."""
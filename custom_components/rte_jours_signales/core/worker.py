@@ -0,0 +1,474 @@
+"""API worker for RTE Jours Signalés integration."""
+from __future__ import annotations
+
+from collections.abc import Callable
+import datetime
+import logging
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from oauthlib.oauth2.rfc6749.errors import OAuth2Error
+import requests
+
+from ..const import (
+    API_REQ_TIMEOUT,
+    API_DEMAND_RESPONSE_SIGNAL_ENDPOINT,
+    API_WORKER_STOP_TIMEOUT,
+    CONFIRM_HOUR,
+    CONFIRM_MIN,
+    FRANCE_TZ,
+    SEED_MAX_AGE,
+    SHARED_CACHE_LEASE_GRACE,
+    SHARED_CACHE_POLL,
+    USER_AGENT,
+)
+from .client import BadRequest, RTEClient, ServerError, UnexpectedError, handle_api_errors
+from .signals import (
+    PayloadError,
+    SignalIndex,
+    decode_signals_payload,
+    parse_signal_days,
+)
+
+if TYPE_CHECKING:
+    from .profiling import CycleProfiler
+    from .shared_cache import SharedCache
+
+_LOGGER = logging.getLogger(__name__)
+
+# Worker methods timed when profiling is enabled, with their stage name
+PROFILED_STAGES = {
+    "_get_access_token": "access_token",
+    "_get_signal_data": "signal_data",
+    "_decode_signal_payload": "json_decode",
+    "_parse_signal_days": "parse",
+    "_compute_wait_time": "wait_time",
+}
+
+class SignalsFreshness(NamedTuple):
+    """Represents the signals freshness: last fetch, last update by RTE and next fetch."""
+
+    Fetched: datetime.datetime | None
+    Updated: datetime.datetime | None
+    NextFetch: datetime.datetime | None
+
+class ApplicationSeed(NamedTuple):
+    """Token and signals fetched while validating the application credentials.
+
+    Signals is None when the validation payload could not be parsed.
+    """
+
+    Token: dict[str, Any]
+    Signals: dict[int, SignalIndex] | None
+    Fetched: float
+
+# https://data.rte-france.com/documents/20182/224298/FR_GU_API_Demand_Response_Signal_v02.00.01.pdf
+class APIWorker(threading.Thread):
+    """API Worker is an autonomous thread querying, parsing an caching the RTE Demand Response Signal API in an optimal way."""
+
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        seed: ApplicationSeed | None = None,
+        *,
+        clock: Callable[[], datetime.datetime] | None = None,
+        rng: random.Random | None = None,
+        client: RTEClient | None = None,
+        shared_cache: SharedCache | None = None,
+    ) -> None:
+        """Initialize the API Worker thread.
+
+        The RTE client is shared with the other fetchers of the application when given
+        (see RTEClient.acquire), else private to the worker. It is released on shutdown.
+        The clock, random generator and client can be injected to run the worker
+        cycles against a simulated timeline (see test/simulation.py).
+        With a shared cache, only the worker holding its lease calls the API.
+        """
+        # Thread
+        self._stopevent = threading.Event()
+        self._clock = clock or _france_now
+        self._rng = rng or random.Random()
+        # OAuth
+        self._client = client or RTEClient(client_id, client_secret)
+        self._client_released = False
+        # Worker
+        self._signals: dict[int, SignalIndex] = {}
+        self._listeners: list[Callable[[], None]] = []
+        self._shared_cache = shared_cache
+        self._freshness = SignalsFreshness(Fetched=None, Updated=None, NextFetch=None)
+        self._max_data_age: datetime.timedelta | None = None
+        # Reuse the config flow validation results for the first cycle, if fresh enough
+        self._seeded = False
+        if seed is not None and time.monotonic() - seed.Fetched < SEED_MAX_AGE:
+            self._client.seed_token(seed.Token)
+            if seed.Signals is not None:
+                self._seeded = True
+                self._set_signals(seed.Signals)
+                self._freshness = self._freshness._replace(Fetched=self._clock())
+        # Init parent thread class
+        super().__init__(name="RTE Demand Response Signal API Worker")
+
+    def get_signals(self) -> dict[int, SignalIndex]:
+        """Get the signal days of every signal, by signal position in the API payload."""
+        return self._signals
+
+    def get_freshness(self) -> SignalsFreshness:
+        """Get the freshness metadata of the signals."""
+        return self._freshness
+
+    def set_max_data_age(self, max_data_age: datetime.timedelta | None) -> None:
+        """Set the age past which the signals are stale, None to never consider them so."""
+        self._max_data_age = max_data_age
+
+    def is_stale(self, localized_now: datetime.datetime) -> bool:
+        """Return True if the last successful fetch is older than the max data age.
+
+        Signals never fetched yet are not stale: their age is unknown.
+        """
+        fetched = self.get_freshness().Fetched
+        return (
+            self._max_data_age is not None
+            and fetched is not None
+            and _elapsed(fetched, localized_now) > self._max_data_age
+        )
+
+    @property
+    def shared_cache_path(self) -> str:
+        """Return the shared cache path, empty if the worker does not use one."""
+        return self._shared_cache.path if self._shared_cache is not None else ""
+
+    def register_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Register a listener called from the worker thread when the signals change.
+
+        Return a callable removing the listener.
+        """
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def set_profiler(self, profiler: CycleProfiler | None) -> None:
+        """Instrument the worker cycle stages with a profiler, or remove it if None."""
+        # Instrumentation lives in instance attributes shadowing the class methods:
+        # dropping them restores the plain methods, with no overhead left behind
+        for name in (*PROFILED_STAGES, "_run_cycle"):
+            self.__dict__.pop(name, None)
+        if profiler is None:
+            return
+        for name, stage in PROFILED_STAGES.items():
+            setattr(self, name, profiler.wrap_stage(stage, getattr(self, name)))
+        self._run_cycle = profiler.wrap_cycle(self._run_cycle)
+
+    def run(self):
+        """Execute thread payload."""
+        _LOGGER.info("Starting thread")
+        stop = False
+        while not stop:
+            wait_time = self._run_cycle()
+            self._freshness = self._freshness._replace(NextFetch=self._clock() + wait_time)
+            stop = self._stopevent.wait(float(wait_time.seconds))
+        # stopping thread
+        _LOGGER.info("Thread stopped")
+
+    def _run_cycle(self) -> datetime.timedelta:
+        """Fetch the signals once and return the time to wait before the next cycle."""
+        localized_now = self._clock()
+        if self._seeded:
+            _LOGGER.debug("Using the signal days fetched by the config flow")
+            self._seeded = False
+            return self._compute_wait_time(localized_now, self._get_last_day())
+        lease_grace = datetime.timedelta(seconds=SHARED_CACHE_LEASE_GRACE)
+        if self._shared_cache is not None and not self._acquire_shared_cache(lease_grace):
+            # Another instance of the host fetches the signals, follow its snapshot
+            if (snapshot := self._shared_cache.read()) is not None:
+                _LOGGER.debug("Loading the signal days fetched at %s", snapshot.Fetched)
+                self._set_signals(snapshot.Signals)
+                self._freshness = self._freshness._replace(Fetched=snapshot.Fetched)
+            return datetime.timedelta(seconds=SHARED_CACHE_POLL)
+        # First auth, unless another fetcher of the client already did it
+        if not self._client.token:
+            self._get_access_token()
+        # Fetch data
+        last_day = self._update_signal_days()
+        # Wait depending on last result fetched
+        wait_time = self._compute_wait_time(localized_now, last_day)
+        if self._shared_cache is not None:
+            if last_day is not None:
+                try:
+                    self._shared_cache.write(self._signals, self._freshness.Fetched)
+                except OSError as exc:
+                    _LOGGER.error(
+                        "Failed to write shared cache %s: %s", self._shared_cache.path, exc
+                    )
+            # Keep the lease until our next fetch is due
+            self._acquire_shared_cache(wait_time + lease_grace)
+        return wait_time
+
+    def signalstop(self, event):
+        """Activate the stop flag in order to stop the thread from within."""
+        _LOGGER.info(
+            "Stopping RTE Demand Response Signal API Worker serial thread reader (received %s)",
+            event,
+        )
+        self._stopevent.set()
+        # Abort our in-flight request, if any, the other fetchers of the client keep theirs
+        self._client.abort(self._stopevent)
+        if not self._client_released:
+            self._client_released = True
+            self._client.release()
+
+    def shutdown(self, event, timeout: float = API_WORKER_STOP_TIMEOUT) -> float:
+        """Stop the thread and wait for it to end, blocking for at most timeout seconds.
+
+        Return the time it took to stop, in seconds.
+        """
+        start = time.monotonic()
+        self.signalstop(event)
+        if self.is_alive():
+            self.join(timeout)
+        stop_duration = time.monotonic() - start
+        if self.is_alive():
+            _LOGGER.error(
+                "RTE Demand Response Signal API Worker still running %.3fs after stop",
+                stop_duration,
+            )
+        else:
+            _LOGGER.info(
+                "RTE Demand Response Signal API Worker stopped in %.3fs (received %s)",
+                stop_duration,
+                event,
+            )
+        return stop_duration
+
+    def _acquire_shared_cache(self, duration: datetime.timedelta) -> bool:
+        """Take or renew the shared cache lease, fetching directly if it is unusable."""
+        try:
+            return self._shared_cache.acquire(duration)
+        except OSError as exc:
+            _LOGGER.error(
+                "Shared cache %s unusable, fetching the signals directly: %s",
+                self._shared_cache.path,
+                exc,
+            )
+            return True
+
+    def _compute_wait_time(
+        self, localized_now: datetime.datetime, last_day: datetime.datetime | None
+    ) -> datetime.timedelta:
+        if not last_day:
+            # something went wrong, retry in 10 minutes
+            return datetime.timedelta(minutes=10)
+        # else compute appropriate wait time depending on date_end
+        day_diff = (last_day.date() - localized_now.date()).days
+
+        if day_diff > 0:
+            # We have next day, check if we need to confirm or wait until tomorrow
+            confirmation_date = datetime.datetime(
+                year=localized_now.year,
+                month=localized_now.month,
+                day=localized_now.day,
+                hour=CONFIRM_HOUR,
+                minute=CONFIRM_MIN,
+                tzinfo=localized_now.tzinfo,
+            )
+            if localized_now > confirmation_date:
+                # We are past the confirmation hour, wait until tomorrow
+                tomorrow = localized_now + datetime.timedelta(days=1)
+                next_call = datetime.datetime(
+                    year=tomorrow.year,
+                    month=tomorrow.month,
+                    day=tomorrow.day,
+                    hour=0,
+                    minute=0,
+                    tzinfo=localized_now.tzinfo,
+                )
+                wait_time = _elapsed(localized_now, next_call)
+                wait_time = datetime.timedelta(
+                    seconds=self._rng.randrange(wait_time.seconds, wait_time.seconds + 900)
+                )
+                _LOGGER.info(
+                    "We got next day, waiting until tomorrow to get futur next day (wait time is %s)",
+                    wait_time,
+                )
+            else:
+                # We aren't past the confirmation hour, wait until confirmation hour
+                next_call = datetime.datetime(
+                    year=localized_now.year,
+                    month=localized_now.month,
+                    day=localized_now.day,
+                    hour=CONFIRM_HOUR,
+                    minute=CONFIRM_MIN,
+                    tzinfo=localized_now.tzinfo,
+                )
+                wait_time = _elapsed(localized_now, next_call)
+                wait_time = datetime.timedelta(
+                    seconds=self._rng.randrange(wait_time.seconds, wait_time.seconds + 900)
+                )
+                _LOGGER.info(
+                    "We got next day, waiting until confirmation hour (wait time is %s)",
+                    wait_time,
+                )
+
+        else:
+            # We do not have next day. This shouldn't happen, let's retry in ~1hour
+            # weird, should not happen
+            wait_time = datetime.timedelta(hours=1)
+            wait_time = datetime.timedelta(
+                seconds=self._rng.randrange(
+                    int(wait_time.seconds * 5 / 6), int(wait_time.seconds * 7 / 6)
+                )
+            )
+            _LOGGER.warning(
+                "Unexpected delta encountered between today and last result, waiting %s as fallback",
+                wait_time,
+            )
+
+        # all good
+        return wait_time
+
+    def _get_access_token(self):
+        try:
+            self._client.fetch_token(timeout=API_REQ_TIMEOUT, interrupt=self._stopevent)
+        except (
+            requests.exceptions.RequestException,
+            OAuth2Error,
+        ) as requests_exception:
+            if self._stopevent.is_set():
+                _LOGGER.debug("Fetching OAuth2 access token interrupted by stop")
+                return
+            _LOGGER.error("Fetching OAuth2 access token failed: %s", requests_exception)
+
+    def _get_signal_data(self) -> requests.Response:
+        headers = {
+            "Accept": "application/json",
+            "User-Agent": USER_AGENT,
+        }
+        _LOGGER.debug(
+            "Calling %s with no params",
+            API_DEMAND_RESPONSE_SIGNAL_ENDPOINT,
+        )
+        # fetch data
+        return self._client.get(
+            API_DEMAND_RESPONSE_SIGNAL_ENDPOINT,
+            headers=headers,
+            timeout=API_REQ_TIMEOUT,
+            interrupt=self._stopevent,
+        )
+
+    def _update_signal_days(self) -> datetime.datetime | None:
+        # Get data
+        try:
+            response = self._get_signal_data()
+            handle_api_errors(response)
+        except requests.exceptions.RequestException as requests_exception:
+            if self._stopevent.is_set():
+                _LOGGER.debug("API request interrupted by stop")
+                return None
+            _LOGGER.error("API request failed: %s", requests_exception)
+            return None
+        except OAuth2Error as oauth_execption:
+            _LOGGER.error("API request failed with OAuth2 error: %s", oauth_execption)
+            return None
+        except (BadRequest, ServerError, UnexpectedError) as http_error:
+            _LOGGER.error("API request failed with HTTP error code: %s", http_error)
+            return None
+        try:
+            payload = self._decode_signal_payload(response)
+            signals = self._parse_signal_days(payload)
+        except PayloadError as payload_error:
+            _LOGGER.error("API response rejected: %s", payload_error)
+            return None
+        # Save data in memory
+        self._set_signals(signals)
+        self._freshness = self._freshness._replace(Fetched=self._clock())
+        return self._get_last_day()
+
+    def _set_signals(self, signals: dict[int, SignalIndex]) -> None:
+        if signals != self._signals:
+            self._signals = signals
+            # Keep the freshness metadata along the signals, not computed by readers
+            self._freshness = self._freshness._replace(
+                Updated=max(
+                    (
+                        signal_index.Updated
+                        for signal_index in signals.values()
+                        if signal_index.Updated is not None
+                    ),
+                    default=None,
+                )
+            )
+            for listener in list(self._listeners):
+                listener()
+
+    def _get_last_day(self) -> datetime.datetime | None:
+        # Return results last day start date in order for caller to compute next call time
+        newest_days = [
+            signal_day
+            for signal_index in self._signals.values()
+            if (signal_day := signal_index.newest()) is not None
+        ]
+        if len(newest_days) > 0:
+            newest_result = max(signal_day.Start for signal_day in newest_days)
+            return datetime.datetime(
+                year=newest_result.year,
+                month=newest_result.month,
+                day=newest_result.day,
+                hour=0,
+                minute=0,
+                second=0,
+                tzinfo=FRANCE_TZ,
+            )
+        return None
+
+    def _decode_signal_payload(self, response: requests.Response) -> Any:
+        return decode_signals_payload(response.content)
+
+    def _parse_signal_days(self, payload: Any) -> dict[int, SignalIndex]:
+        return parse_signal_days(payload)
+
+def _france_now() -> datetime.datetime:
+    return datetime.datetime.now(FRANCE_TZ)
+
+def _elapsed(start: datetime.datetime, end: datetime.datetime) -> datetime.timedelta:
+    # Same tzinfo datetimes substract as wall times, which is wrong across DST changes
+    return end.astimezone(datetime.timezone.utc) - start.astimezone(datetime.timezone.utc)
+
+def application_tester(
+    client_id: str, client_secret: str, timeout: float = API_REQ_TIMEOUT * 2
+) -> ApplicationSeed:
+    """Test application credentials against the API.
+
+    Each request is given what remains of the timeout budget (in seconds). The token
+    and signal days fetched are returned to seed the API worker.
+    """
+    deadline = time.monotonic() + timeout
+
+    def remaining() -> float:
+        if (left := deadline - time.monotonic()) <= 0:
+            raise requests.exceptions.Timeout("Application validation deadline exceeded")
+        return min(left, API_REQ_TIMEOUT)
+
+    client = RTEClient(client_id, client_secret, min_interval=0)
+    try:
+        client.fetch_token(timeout=remaining())
+        response = client.get(
+            API_DEMAND_RESPONSE_SIGNAL_ENDPOINT,
+            headers={"Accept": "application/json", "User-Agent": USER_AGENT},
+            timeout=remaining(),
+        )
+        token = client.token
+    finally:
+        client.release()
+    handle_api_errors(response)
+    # Credentials are valid: an unexpected payload only prevents seeding the signals
+    try:
+        signals = parse_signal_days(decode_signals_payload(response.content))
+    except PayloadError as exc:
+        _LOGGER.warning("Unexpected payload while validating the application: %s", exc)
+        signals = None
+    return ApplicationSeed(
+        Token=token,
+        Signals=signals,
+        Fetched=time.monotonic(),
+    )
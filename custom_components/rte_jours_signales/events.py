@@ -0,0 +1,131 @@
+"""Bus events fired ahead of the RTE Jours Signalés signal days."""
+from __future__ import annotations
+
+from collections.abc import Callable
+import datetime
+import functools
+import logging
+from typing import NamedTuple
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+from .core.signals import SignalDay
+from .core.worker import APIWorker
+from .const import (
+    API_VALUE_SIGNAL_NOT_REPORTED,
+    EVENT_SIGNAL_END,
+    EVENT_SIGNAL_START,
+)
+from .sensor import get_signal_name
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SignalEvent(NamedTuple):
+    """Represents an event of a signal day, due a lead time before its start or at its end."""
+
+    Signal: int
+    Type: str
+    LeadTime: int
+    Day: SignalDay
+
+    @property
+    def when(self) -> datetime.datetime:
+        """Return when the event is due."""
+        if self.Type == EVENT_SIGNAL_END:
+            return self.Day.End
+        return self.Day.Start - datetime.timedelta(minutes=self.LeadTime)
+
+
+class SignalEventScheduler:
+    """Schedule a point in time timer per event of the reported signal days."""
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, api_worker: APIWorker, lead_times: list[int]
+    ) -> None:
+        """Initialize the signal event scheduler."""
+        self._hass = hass
+        self._entry_id = entry_id
+        self._api_worker = api_worker
+        self._lead_times = lead_times
+        self._timers: dict[tuple, Callable[[], None]] = {}
+
+    @callback
+    def async_set_lead_times(self, lead_times: list[int]) -> None:
+        """Change the lead times (in minutes) of the start events."""
+        self._lead_times = lead_times
+        self.async_update()
+
+    @callback
+    def async_update(self) -> None:
+        """Schedule the events of new or changed signal days, cancel the stale ones."""
+        now = dt_util.utcnow()
+        events = {
+            _event_key(event): event
+            for event in self._events()
+            if event.when > now
+        }
+        for key in self._timers.keys() - events.keys():
+            self._timers.pop(key)()
+        for key in events.keys() - self._timers.keys():
+            event = events[key]
+            self._timers[key] = async_track_point_in_time(
+                self._hass, functools.partial(self._async_fire, key, event), event.when
+            )
+        _LOGGER.debug("%d signal events scheduled", len(self._timers))
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel every scheduled event."""
+        for cancel in self._timers.values():
+            cancel()
+        self._timers.clear()
+
+    def _events(self) -> list[SignalEvent]:
+        events = []
+        for signal_id, signal_index in self._api_worker.get_signals().items():
+            for signal_day in signal_index.Days:
+                if signal_day.Value == API_VALUE_SIGNAL_NOT_REPORTED:
+                    continue
+                events += [
+                    SignalEvent(signal_id, EVENT_SIGNAL_START, lead_time, signal_day)
+                    for lead_time in self._lead_times
+                ]
+                events.append(SignalEvent(signal_id, EVENT_SIGNAL_END, 0, signal_day))
+        return events
+
+    @callback
+    def _async_fire(self, key: tuple, event: SignalEvent, now: datetime.datetime) -> None:
+        self._timers.pop(key, None)
+        data = {
+            "entry_id": self._entry_id,
+            "signal": event.Signal,
+            "value": get_signal_name(event.Day.Value),
+            "start": event.Day.Start.isoformat(),
+            "end": event.Day.End.isoformat(),
+        }
+        if event.Type == EVENT_SIGNAL_START:
+            data["lead_time"] = event.LeadTime
+        self._hass.bus.async_fire(event.Type, data)
+
+
+def parse_lead_times(lead_times: str) -> list[int]:
+    """Parse comma separated lead times in minutes, raising ValueError if invalid."""
+    minutes = sorted({int(lead_time) for lead_time in lead_times.split(",") if lead_time.strip()})
+    if minutes and minutes[0] < 0:
+        raise ValueError(f"negative lead time {minutes[0]}")
+    return minutes
+
+
+def _event_key(event: SignalEvent) -> tuple:
+    # The update date alone does not change the event, so it does not reschedule it
+    return (
+        event.Signal,
+        event.Type,
+        event.LeadTime,
+        event.Day.Start,
+        event.Day.End,
+        event.Day.Value,
+    )
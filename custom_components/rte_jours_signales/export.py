@@ -0,0 +1,143 @@
+"""HTTP export of the RTE Jours Signalés signal days (JSON and iCalendar)."""
+from __future__ import annotations
+
+import datetime
+import hashlib
+import json
+import logging
+from typing import NamedTuple
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .core.signals import SignalIndex
+from .core.worker import APIWorker
+from .const import (
+    API_VALUE_SIGNAL_NOT_REPORTED,
+    DATA_EXPORTS,
+    DEVICE_NAME,
+    DOMAIN,
+    EXPORT_FORMAT_ICS,
+    EXPORT_FORMAT_JSON,
+)
+from .sensor import get_signal_name
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ExportRender(NamedTuple):
+    """Represents a pre-rendered export."""
+
+    Body: bytes
+    ContentType: str
+    ETag: str
+
+
+class SignalExport:
+    """Exports of an API worker signal days, rendered once per signals change."""
+
+    def __init__(self, entry_id: str, api_worker: APIWorker) -> None:
+        """Initialize the signal export."""
+        self._entry_id = entry_id
+        self._api_worker = api_worker
+        self._renders: dict[str, ExportRender] = {}
+        self.refresh()
+
+    def get(self, export_format: str) -> ExportRender | None:
+        """Return the render of an export format, if known."""
+        return self._renders.get(export_format)
+
+    def refresh(self) -> None:
+        """Render the exports of the current signals."""
+        signals = self._api_worker.get_signals()
+        # Swap the whole dict so that readers never see a partial refresh
+        self._renders = {
+            EXPORT_FORMAT_JSON: _render(render_json(signals), "application/json"),
+            EXPORT_FORMAT_ICS: _render(render_ics(self._entry_id, signals), "text/calendar"),
+        }
+        _LOGGER.debug("Signal exports of %s rendered", self._entry_id)
+
+
+class SignalExportView(HomeAssistantView):
+    """Serve the signal exports of every config entry."""
+
+    url = f"/api/{DOMAIN}/{{entry_id}}/signals.{{export_format}}"
+    name = f"api:{DOMAIN}:signals"
+    requires_auth = True
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the signal export view."""
+        self._hass = hass
+
+    async def get(
+        self, request: web.Request, entry_id: str, export_format: str
+    ) -> web.Response:
+        """Return an export, or 304 if the client already has it."""
+        export: SignalExport | None = self._hass.data.get(DATA_EXPORTS, {}).get(entry_id)
+        if export is None or (render := export.get(export_format)) is None:
+            return web.Response(status=404)
+        headers = {"ETag": render.ETag, "Cache-Control": "no-cache"}
+        if render.ETag in (
+            etag.strip() for etag in request.headers.get("If-None-Match", "").split(",")
+        ):
+            return web.Response(status=304, headers=headers)
+        return web.Response(
+            body=render.Body, content_type=render.ContentType, headers=headers
+        )
+
+
+def render_json(signals: dict[int, SignalIndex]) -> bytes:
+    """Render the signal days as JSON."""
+    return json.dumps(
+        {
+            "signals": {
+                str(signal_id): [
+                    {
+                        "start": signal_day.Start.isoformat(),
+                        "end": signal_day.End.isoformat(),
+                        "value": signal_day.Value,
+                        "name": get_signal_name(signal_day.Value),
+                        "updated": signal_day.Updated.isoformat(),
+                    }
+                    for signal_day in signal_index.Days
+                ]
+                for signal_id, signal_index in signals.items()
+            }
+        }
+    ).encode()
+
+
+def render_ics(entry_id: str, signals: dict[int, SignalIndex]) -> bytes:
+    """Render the signaled days as an iCalendar feed, one all-day event per day."""
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:-//{DOMAIN}//{DEVICE_NAME}//FR",
+        "CALSCALE:GREGORIAN",
+    ]
+    for signal_id, signal_index in signals.items():
+        for signal_day in signal_index.Days:
+            if signal_day.Value == API_VALUE_SIGNAL_NOT_REPORTED:
+                continue
+            start = signal_day.Start.date()
+            lines += [
+                "BEGIN:VEVENT",
+                f"UID:{entry_id}-{signal_id}-{start:%Y%m%d}@{DOMAIN}",
+                f"DTSTAMP:{signal_day.Updated.astimezone(datetime.timezone.utc):%Y%m%dT%H%M%SZ}",
+                f"DTSTART;VALUE=DATE:{start:%Y%m%d}",
+                f"DTEND;VALUE=DATE:{signal_day.End.date():%Y%m%d}",
+                f"SUMMARY:{DEVICE_NAME} {signal_id}: {get_signal_name(signal_day.Value)}",
+                "END:VEVENT",
+            ]
+    lines.append("END:VCALENDAR")
+    return ("\r\n".join(lines) + "\r\n").encode()
+
+
+def _render(body: bytes, content_type: str) -> ExportRender:
+    return ExportRender(
+        Body=body,
+        ContentType=content_type,
+        ETag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+    )
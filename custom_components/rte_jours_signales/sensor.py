@@ -5,14 +5,17 @@ import asyncio
 import datetime
 import logging
 
+from typing import Any
+
 from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .api_worker import APIWorker
+from .core.worker import APIWorker
 from .const import (
     API_ATTRIBUTION,
     API_REQ_TIMEOUT,
@@ -52,15 +55,39 @@ async def async_setup_entry(
             config_entry.title,
         )
         return
-    # Wait request timeout to let API worker get first batch of data before initializing sensors
-    await asyncio.sleep(API_REQ_TIMEOUT)
-    # Init sensors
-    sensors = [
-        CurrentSignal(config_entry.entry_id, api_worker),
-        NextSignal(config_entry.entry_id, api_worker),
-    ]
-    # Add the entities to HA
-    async_add_entities(sensors, True)
+    # Wait request timeout to let API worker get first batch of data before initializing sensors,
+    # unless it has been seeded by the config flow
+    if not api_worker.get_signals():
+        await asyncio.sleep(API_REQ_TIMEOUT)
+    # Init sensors of the main signal, then of each other signal when it first shows up
+    known_signals: set[int] = set()
+
+    @callback
+    def async_add_signal_sensors() -> None:
+        new_signals = sorted({0, *api_worker.get_signals()} - known_signals)
+        if not new_signals:
+            return
+        sensors: list[SensorEntity] = []
+        for signal_id in new_signals:
+            _LOGGER.debug("%s: adding sensors for signal %d", config_entry.title, signal_id)
+            known_signals.add(signal_id)
+            sensors.append(CurrentSignal(config_entry.entry_id, api_worker, signal_id))
+            sensors.append(NextSignal(config_entry.entry_id, api_worker, signal_id))
+        # Add the entities to HA
+        async_add_entities(sensors, True)
+
+    async_add_signal_sensors()
+    # Init the freshness diagnostic sensors
+    async_add_entities(
+        [
+            sensor_class(config_entry.entry_id, api_worker)
+            for sensor_class in (LastFetch, DataUpdated, DataAge, NextFetch)
+        ],
+        True,
+    )
+    config_entry.async_on_unload(
+        api_worker.register_listener(lambda: hass.add_job(async_add_signal_sensors))
+    )
 
 
 class CurrentSignal(SensorEntity):
@@ -73,12 +100,20 @@ class CurrentSignal(SensorEntity):
     _attr_device_class = SensorDeviceClass.ENUM
     _attr_icon = "mdi:transmission-tower"
 
-    def __init__(self, config_id: str, api_worker: APIWorker) -> None:
+    def __init__(
+        self, config_id: str, api_worker: APIWorker, signal_id: int = 0
+    ) -> None:
         """Initialize the Current Signal Sensor."""
 
-        self.entity_id = f"sensor.{DOMAIN}_signal_current"
-        self._attr_unique_id = f"{DOMAIN}_{config_id}_signal_current"
-        self._attr_translation_key = "signal_current"
+        if signal_id == 0:
+            self.entity_id = f"sensor.{DOMAIN}_signal_current"
+            self._attr_unique_id = f"{DOMAIN}_{config_id}_signal_current"
+            self._attr_translation_key = "signal_current"
+        else:
+            self.entity_id = f"sensor.{DOMAIN}_signal_{signal_id}_current"
+            self._attr_unique_id = f"{DOMAIN}_{config_id}_signal_{signal_id}_current"
+            self._attr_translation_key = "signal_n_current"
+            self._attr_translation_placeholders = {"signal": str(signal_id)}
         self._attr_options = [
             SENSOR_SIGNAL_NOT_REPORTED_NAME,
             SENSOR_SIGNAL_EXPLICIT_NAME,
@@ -89,6 +124,7 @@ class CurrentSignal(SensorEntity):
         self._attr_native_value: str | None = None
         self._config_id = config_id
         self._api_worker = api_worker
+        self._signal_id = signal_id
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -104,13 +140,16 @@ class CurrentSignal(SensorEntity):
     @callback
     def update(self) -> None:
         """Update the value of the sensor from the thread object memory cache."""
-        self._attr_available = True
         localized_now = _current_datetime()
-        for signal_day in self._api_worker.get_signal_days():
-            if signal_day.Start <= localized_now < signal_day.End:
-                # Found a match !
-                self._attr_native_value = get_signal_name(signal_day.Value)
-                return
+        self._attr_available = not self._api_worker.is_stale(localized_now)
+        if not self._attr_available:
+            _LOGGER.debug("Current signal is stale at this time (%s)", localized_now)
+            return
+        signal_index = self._api_worker.get_signals().get(self._signal_id)
+        if signal_index and (signal_day := signal_index.current(localized_now)):
+            # Found a match !
+            self._attr_native_value = get_signal_name(signal_day.Value)
+            return
         # Nothing found
         _LOGGER.debug("Current signal is not available at this time (%s)", localized_now)
         self._attr_native_value = SENSOR_SIGNAL_UNKNOWN_NAME
@@ -126,12 +165,20 @@ class NextSignal(SensorEntity):
     _attr_device_class = SensorDeviceClass.ENUM
     _attr_icon = "mdi:transmission-tower-export"
 
-    def __init__(self, config_id: str, api_worker: APIWorker) -> None:
+    def __init__(
+        self, config_id: str, api_worker: APIWorker, signal_id: int = 0
+    ) -> None:
         """Initialize the Next Signal Sensor."""
 
-        self.entity_id = f"sensor.{DOMAIN}_signal_next"
-        self._attr_unique_id = f"{DOMAIN}_{config_id}_signal_next"
-        self._attr_translation_key = "signal_next"
+        if signal_id == 0:
+            self.entity_id = f"sensor.{DOMAIN}_signal_next"
+            self._attr_unique_id = f"{DOMAIN}_{config_id}_signal_next"
+            self._attr_translation_key = "signal_next"
+        else:
+            self.entity_id = f"sensor.{DOMAIN}_signal_{signal_id}_next"
+            self._attr_unique_id = f"{DOMAIN}_{config_id}_signal_{signal_id}_next"
+            self._attr_translation_key = "signal_n_next"
+            self._attr_translation_placeholders = {"signal": str(signal_id)}
         self._attr_options = [
             SENSOR_SIGNAL_NOT_REPORTED_NAME,
             SENSOR_SIGNAL_EXPLICIT_NAME,
@@ -142,6 +189,7 @@ class NextSignal(SensorEntity):
         self._attr_native_value: str | None = None
         self._config_id = config_id
         self._api_worker = api_worker
+        self._signal_id = signal_id
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -157,16 +205,119 @@ class NextSignal(SensorEntity):
     @callback
     def update(self) -> None:
         """Update the value of the sensor from the thread object memory cache."""
-        self._attr_available = True
         localized_now = _current_datetime()
-        for signal_day in self._api_worker.get_signal_days():
-            if localized_now < signal_day.Start:
-                # Found a match !
-                self._attr_native_value = get_signal_name(signal_day.Value)
-                return
+        self._attr_available = not self._api_worker.is_stale(localized_now)
+        if not self._attr_available:
+            _LOGGER.debug("Next signal is stale at this time (%s)", localized_now)
+            return
+        signal_index = self._api_worker.get_signals().get(self._signal_id)
+        if signal_index and (signal_day := signal_index.next(localized_now)):
+            # Found a match !
+            self._attr_native_value = get_signal_name(signal_day.Value)
+            return
         _LOGGER.debug("Next signal is not available at this time (%s)", localized_now)
         self._attr_native_value = SENSOR_SIGNAL_UNKNOWN_NAME
 
+class FreshnessSensor(SensorEntity):
+    """Base of the signals freshness diagnostic sensors."""
+
+    # Generic properties
+    _attr_has_entity_name = True
+    _attr_attribution = API_ATTRIBUTION
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    # Sensor properties
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_icon = "mdi:update"
+    # Set by subclasses
+    _key: str
+
+    def __init__(self, config_id: str, api_worker: APIWorker) -> None:
+        """Initialize the freshness sensor."""
+        self.entity_id = f"sensor.{DOMAIN}_{self._key}"
+        self._attr_unique_id = f"{DOMAIN}_{config_id}_{self._key}"
+        self._attr_translation_key = self._key
+        self._attr_native_value = None
+        self._config_id = config_id
+        self._api_worker = api_worker
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device info."""
+        return DeviceInfo(
+            entry_type=DeviceEntryType.SERVICE,
+            identifiers={(DOMAIN, self._config_id)},
+            name=DEVICE_NAME,
+            manufacturer=DEVICE_MANUFACTURER,
+            model=DEVICE_MODEL,
+        )
+
+
+class LastFetch(FreshnessSensor):
+    """Last successful fetch of the signals Sensor Entity."""
+
+    _key = "last_fetch"
+
+    @callback
+    def update(self) -> None:
+        """Update the value of the sensor from the thread object freshness metadata."""
+        self._attr_native_value = self._api_worker.get_freshness().Fetched
+
+
+class DataUpdated(FreshnessSensor):
+    """Last update of the signals by RTE Sensor Entity, with the update of each day."""
+
+    _key = "data_updated"
+
+    @callback
+    def update(self) -> None:
+        """Update the value of the sensor from the thread object freshness metadata."""
+        self._attr_native_value = self._api_worker.get_freshness().Updated
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the updated_date of each day, by signal."""
+        return {
+            "updated_dates": {
+                str(signal_id): {
+                    signal_day.Start.date().isoformat(): signal_day.Updated.isoformat()
+                    for signal_day in signal_index.Days
+                }
+                for signal_id, signal_index in self._api_worker.get_signals().items()
+            }
+        }
+
+
+class DataAge(FreshnessSensor):
+    """Age of the signals since their last successful fetch Sensor Entity."""
+
+    _key = "data_age"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+    _attr_icon = "mdi:timer-sand"
+
+    @callback
+    def update(self) -> None:
+        """Update the value of the sensor from the thread object freshness metadata."""
+        if (fetched := self._api_worker.get_freshness().Fetched) is None:
+            self._attr_native_value = None
+            return
+        # Aware datetimes of distinct tzinfo substract as UTC, whatever the DST changes
+        age = datetime.datetime.now(datetime.timezone.utc) - fetched
+        self._attr_native_value = int(age.total_seconds() // 60)
+
+
+class NextFetch(FreshnessSensor):
+    """Next scheduled fetch of the signals Sensor Entity."""
+
+    _key = "next_fetch"
+    _attr_icon = "mdi:clock-outline"
+
+    @callback
+    def update(self) -> None:
+        """Update the value of the sensor from the thread object freshness metadata."""
+        self._attr_native_value = self._api_worker.get_freshness().NextFetch
+
+
 def _current_datetime() -> datetime:
     """Return the current datetime"""
     return datetime.datetime.now(FRANCE_TZ)
@@ -4,7 +4,7 @@ from unittest.mock import patch
 
 import pytest
 
-from .const import MOCK_SIGNAL_DAY
+from .const import MOCK_SIGNALS, get_mock_application_seed
 
 pytest_plugins = "pytest_homeassistant_custom_component"
 
@@ -37,11 +37,11 @@ def bypass_integration_setup():
 
 
 @pytest.fixture()
-def mock_get_signal_days():
-    """Fixture to replace 'APIWorker.get_signal_days' method with a mock."""
+def mock_get_signals():
+    """Fixture to replace 'APIWorker.get_signals' method with a mock."""
     with patch(
-        "custom_components.rte_jours_signales.api_worker.APIWorker.get_signal_days",
-        return_value=MOCK_SIGNAL_DAY,
+        "custom_components.rte_jours_signales.core.worker.APIWorker.get_signals",
+        return_value=MOCK_SIGNALS,
     ) as mock:
         yield mock
 
@@ -49,8 +49,8 @@ def mock_get_signal_days():
 def mock_application_tester():
     """Fixture to replace 'application_tester' method with a mock."""
     with patch(
-        "custom_components.rte_jours_signales.api_worker.application_tester",
-        return_value=None,
+        "custom_components.rte_jours_signales.core.worker.application_tester",
+        return_value=get_mock_application_seed(),
     ) as mock:
         yield mock
 
@@ -58,7 +58,7 @@ def mock_application_tester():
 def mock_get_access_token():
     """Fixture to replace 'APIWorker.get_signal_days' method with a mock."""
     with patch(
-        "custom_components.rte_jours_signales.api_worker.APIWorker._get_access_token",
+        "custom_components.rte_jours_signales.core.worker.APIWorker._get_access_token",
         return_value=None,
     ) as mock:
         yield mock
@@ -67,7 +67,7 @@ def mock_get_access_token():
 def mock_update_signal_days():
     """Fixture to replace 'APIWorker.get_signal_days' method with a mock."""
     with patch(
-        "custom_components.rte_jours_signales.api_worker.APIWorker._update_signal_days",
+        "custom_components.rte_jours_signales.core.worker.APIWorker._update_signal_days",
         return_value=None,
     ) as mock:
         yield mock
@@ -1,8 +1,10 @@
 """Constants for testing."""
 
 import datetime
+import time
 
-from custom_components.rte_jours_signales.api_worker import SignalDay
+from custom_components.rte_jours_signales.core.signals import SignalDay, SignalIndex
+from custom_components.rte_jours_signales.core.worker import ApplicationSeed
 from custom_components.rte_jours_signales.const import FRANCE_TZ
 
 MOCK_CLIENT_ID = "my-client-id"
@@ -34,3 +36,13 @@ def get_mock_signal_day() -> list[SignalDay]:
     return signal_days_time
 
 MOCK_SIGNAL_DAY = get_mock_signal_day()
+
+MOCK_SIGNALS = {0: SignalIndex.from_days(MOCK_SIGNAL_DAY)}
+
+def get_mock_application_seed() -> ApplicationSeed:
+    """Build an ApplicationSeed, fetched now so that it is fresh enough to be used"""
+    return ApplicationSeed(
+        Token={"access_token": "my-access-token", "token_type": "Bearer", "expires_in": 7200},
+        Signals=MOCK_SIGNALS,
+        Fetched=time.monotonic(),
+    )
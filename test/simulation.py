@@ -0,0 +1,174 @@
+"""Virtual clock simulation of the RTE Jours Signalés API worker fetch loop."""
+from __future__ import annotations
+
+import bisect
+from collections.abc import Callable
+import datetime
+import json
+import random
+from typing import Any, NamedTuple
+
+import requests
+
+from custom_components.rte_jours_signales.core.client import RTEClient
+from custom_components.rte_jours_signales.core.worker import APIWorker
+from custom_components.rte_jours_signales.const import (
+    API_KEY_END,
+    API_KEY_SIGNALED_DATES,
+    API_KEY_SIGNALS,
+    API_KEY_START,
+    API_KEY_UPDATED,
+    API_KEY_VALUE,
+    API_VALUE_SIGNAL_NOT_REPORTED,
+    CONFIRM_HOUR,
+    CONFIRM_MIN,
+    FRANCE_TZ,
+)
+
+# Days already over kept in the simulated payloads
+SIMULATION_HISTORY_DAYS = 7
+
+
+class SimulationReport(NamedTuple):
+    """Represents the efficiency figures of a simulation run."""
+
+    ApiCalls: int
+    TokenCalls: int
+    Wakeups: int
+    LongestStaleness: datetime.timedelta
+    ConfirmationLatencies: dict[datetime.date, datetime.timedelta]
+
+
+class VirtualClock:
+    """Clock only moving forward when advanced, returning France localized datetimes."""
+
+    def __init__(self, start: datetime.datetime) -> None:
+        """Initialize the virtual clock."""
+        # Keep UTC internally so advancing ignores DST changes, like a real clock
+        self._now = start.astimezone(datetime.timezone.utc)
+
+    def __call__(self) -> datetime.datetime:
+        """Return the current virtual datetime."""
+        return self._now.astimezone(FRANCE_TZ)
+
+    def advance(self, delta: datetime.timedelta) -> None:
+        """Move the virtual clock forward."""
+        self._now += delta
+
+
+class SimulatedTransport:
+    """OAuth2 session stand-in serving the signals published at the virtual time.
+
+    The signal of a day is published at the start of the previous day, then
+    confirmed (with its final value) at the confirmation time of the previous day.
+    """
+
+    def __init__(
+        self,
+        clock: VirtualClock,
+        values: Callable[[datetime.date], int] | None = None,
+        confirm_time: datetime.time = datetime.time(CONFIRM_HOUR, CONFIRM_MIN),
+    ) -> None:
+        """Initialize the simulated transport."""
+        self.token: dict[str, Any] = {}
+        self.token_calls = 0
+        # UTC datetimes of every signals request
+        self.fetches: list[datetime.datetime] = []
+        self._clock = clock
+        self._values = values or (lambda day: API_VALUE_SIGNAL_NOT_REPORTED)
+        self._confirm_time = confirm_time
+
+    def fetch_token(self, **kwargs) -> dict[str, Any]:
+        """Deliver a new access token."""
+        self.token_calls += 1
+        self.token = {"access_token": "simulation", "token_type": "Bearer"}
+        return self.token
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Answer a signals API request with the currently published days."""
+        localized_now = self._clock()
+        self.fetches.append(localized_now.astimezone(datetime.timezone.utc))
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(self.payload(localized_now)).encode()
+        return response
+
+    def publication(self, day: datetime.date) -> datetime.datetime:
+        """Return when the given day signal is first published."""
+        return _localize(day - datetime.timedelta(days=1), datetime.time())
+
+    def confirmation(self, day: datetime.date) -> datetime.datetime:
+        """Return when the given day signal is confirmed."""
+        return _localize(day - datetime.timedelta(days=1), self._confirm_time)
+
+    def payload(self, localized_now: datetime.datetime) -> dict[str, Any]:
+        """Build the API payload as published at the given datetime."""
+        today = localized_now.date()
+        signaled_dates = []
+        for offset in range(1, -SIMULATION_HISTORY_DAYS - 1, -1):
+            day = today + datetime.timedelta(days=offset)
+            if localized_now < self.publication(day):
+                continue
+            if localized_now < self.confirmation(day):
+                value, updated = API_VALUE_SIGNAL_NOT_REPORTED, self.publication(day)
+            else:
+                value, updated = self._values(day), self.confirmation(day)
+            signaled_dates.append(
+                {
+                    API_KEY_START: _localize(day, datetime.time()).isoformat(),
+                    API_KEY_END: _localize(
+                        day + datetime.timedelta(days=1), datetime.time()
+                    ).isoformat(),
+                    API_KEY_VALUE: value,
+                    API_KEY_UPDATED: updated.isoformat(),
+                }
+            )
+        return {API_KEY_SIGNALS: [{API_KEY_SIGNALED_DATES: signaled_dates}]}
+
+
+def simulate(
+    start: datetime.datetime,
+    duration: datetime.timedelta,
+    seed: int = 0,
+    values: Callable[[datetime.date], int] | None = None,
+    confirm_time: datetime.time = datetime.time(CONFIRM_HOUR, CONFIRM_MIN),
+) -> SimulationReport:
+    """Replay the API worker fetch loop over a virtual timeline and report its efficiency."""
+    clock = VirtualClock(start)
+    transport = SimulatedTransport(clock, values, confirm_time)
+    api_worker = APIWorker(
+        "simulation",
+        "simulation",
+        clock=clock,
+        rng=random.Random(seed),
+        client=RTEClient("simulation", "simulation", session=transport, min_interval=0),
+    )
+    end = clock() + duration
+    wakeups = 0
+    while clock() < end:
+        wait_time = api_worker._run_cycle()
+        wakeups += 1
+        # Mirror APIWorker.run which waits for the seconds part of the wait time
+        clock.advance(datetime.timedelta(seconds=wait_time.seconds))
+    # Match every publication and confirmation with the first fetch picking it up
+    longest_staleness = datetime.timedelta()
+    confirmation_latencies: dict[datetime.date, datetime.timedelta] = {}
+    day = start.astimezone(FRANCE_TZ).date() + datetime.timedelta(days=1)
+    while transport.confirmation(day) < transport.fetches[-1]:
+        for event in (transport.publication(day), transport.confirmation(day)):
+            event = event.astimezone(datetime.timezone.utc)
+            pickup = transport.fetches[bisect.bisect_left(transport.fetches, event)]
+            longest_staleness = max(longest_staleness, pickup - event)
+        confirmation_latencies[day] = pickup - event
+        day += datetime.timedelta(days=1)
+    return SimulationReport(
+        ApiCalls=len(transport.fetches),
+        TokenCalls=transport.token_calls,
+        Wakeups=wakeups,
+        LongestStaleness=longest_staleness,
+        ConfirmationLatencies=confirmation_latencies,
+    )
+
+
+def _localize(day: datetime.date, time: datetime.time) -> datetime.datetime:
+    return datetime.datetime.combine(day, time, tzinfo=FRANCE_TZ)
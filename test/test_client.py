@@ -0,0 +1,73 @@
+"""Test for the RTE Jours Signalés integration RTE client."""
+
+import threading
+import time
+from unittest.mock import Mock
+
+from oauthlib.oauth2 import TokenExpiredError
+
+from custom_components.rte_jours_signales.core.client import RateLimiter, RTEClient
+from .const import MOCK_CLIENT_ID, MOCK_CLIENT_SECRET
+
+
+def test_acquire_shares_client():
+    """Test that the fetchers of an application share its client until the last release."""
+    client = RTEClient.acquire(MOCK_CLIENT_ID, MOCK_CLIENT_SECRET)
+    assert RTEClient.acquire(MOCK_CLIENT_ID, MOCK_CLIENT_SECRET) is client
+    assert RTEClient.acquire(MOCK_CLIENT_ID, "other-secret") is not client
+
+    client.release()
+    assert RTEClient.acquire(MOCK_CLIENT_ID, MOCK_CLIENT_SECRET) is client
+    client.release()
+    client.release()
+    RTEClient.acquire(MOCK_CLIENT_ID, "other-secret").release()
+    RTEClient.acquire(MOCK_CLIENT_ID, "other-secret").release()
+
+    # Closed once released by its last fetcher
+    new_client = RTEClient.acquire(MOCK_CLIENT_ID, MOCK_CLIENT_SECRET)
+    assert new_client is not client
+    new_client.release()
+
+
+def test_expired_token_fetched_once():
+    """Test that an expired token is only renewed by the first fetcher noticing it."""
+    session = Mock(token={"access_token": "expired"})
+    response = Mock()
+    session.get.side_effect = [TokenExpiredError(), response, response]
+
+    def fetch_token(**kwargs):
+        session.token = {"access_token": "renewed"}
+
+    session.fetch_token.side_effect = fetch_token
+    client = RTEClient(MOCK_CLIENT_ID, MOCK_CLIENT_SECRET, session=session, min_interval=0)
+    expired = client.token
+
+    assert client.get("https://example.com", headers={}) is response
+    # Another fetcher which got the expired token too does not fetch it again
+    client.fetch_token(expired=expired)
+    assert session.fetch_token.call_count == 1
+    assert client.token == {"access_token": "renewed"}
+    # A seed does not replace the current token
+    client.seed_token({"access_token": "seed"})
+    assert client.token == {"access_token": "renewed"}
+
+
+def test_rate_limiter():
+    """Test that the requests of every thread are spaced by the minimal interval."""
+    rate_limiter = RateLimiter(0.05)
+    interrupt = threading.Event()
+    start = time.monotonic()
+    threads = [threading.Thread(target=rate_limiter.wait, args=(interrupt,)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert time.monotonic() - start >= 0.1
+
+    # Interrupted waits return at once
+    rate_limiter = RateLimiter(60)
+    interrupt.set()
+    rate_limiter.wait(interrupt)
+    rate_limiter.wait(interrupt)
+    assert time.monotonic() - start < 5
@@ -2,10 +2,21 @@
 
 from homeassistant import config_entries
 from homeassistant.data_entry_flow import FlowResultType
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
 from custom_components.rte_jours_signales.const import (
     DOMAIN,
     CONFIG_CLIEND_SECRET,
-    CONFIG_CLIENT_ID
+    CONFIG_CLIENT_ID,
+    DATA_SEEDS,
+    DEFAULT_EVENT_LEAD_TIMES,
+    DEFAULT_MAX_DATA_AGE,
+    OPTION_EVENT_LEAD_TIMES,
+    OPTION_MAX_DATA_AGE,
+    OPTION_PROFILING,
+    OPTION_PROFILING_CPROFILE_CYCLES,
+    OPTION_SHARED_CACHE_PATH,
+    PROFILING_LOG,
 )
 from .const import MOCK_CLIENT_ID, MOCK_CLIENT_SECRET
 
@@ -40,3 +51,63 @@ async def test_config_flow_user_step_ok(
     assert result["data"] == {CONFIG_CLIENT_ID: MOCK_CLIENT_ID, CONFIG_CLIEND_SECRET: MOCK_CLIENT_SECRET}
     assert result["options"] == {}
     assert result["result"]
+
+    # the validation results should be handed over to the entry setup
+    assert hass.data[DATA_SEEDS][f"{DOMAIN}_{MOCK_CLIENT_ID}"] == mock_application_tester.return_value
+
+async def test_options_flow_profiling(anyio_backend, hass, bypass_integration_setup):
+    """Test that the options flow stores the profiling options."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONFIG_CLIENT_ID: MOCK_CLIENT_ID, CONFIG_CLIEND_SECRET: MOCK_CLIENT_SECRET},
+        options={},
+        entry_id="mock",
+    )
+    config_entry.add_to_hass(hass)
+
+    # Init the options flow
+    result = await hass.config_entries.options.async_init(config_entry.entry_id)
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    # Enable profiling as structured logs with 2 cProfile cycles
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={OPTION_PROFILING: PROFILING_LOG, OPTION_PROFILING_CPROFILE_CYCLES: 2},
+    )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert config_entry.options == {
+        OPTION_PROFILING: PROFILING_LOG,
+        OPTION_PROFILING_CPROFILE_CYCLES: 2,
+        OPTION_SHARED_CACHE_PATH: "",
+        OPTION_EVENT_LEAD_TIMES: DEFAULT_EVENT_LEAD_TIMES,
+        OPTION_MAX_DATA_AGE: DEFAULT_MAX_DATA_AGE,
+    }
+
+
+async def test_options_flow_shared_cache_path(
+    anyio_backend, hass, bypass_integration_setup, tmp_path
+):
+    """Test that the options flow only accepts a shared cache path it can write."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONFIG_CLIENT_ID: MOCK_CLIENT_ID, CONFIG_CLIEND_SECRET: MOCK_CLIENT_SECRET},
+        options={},
+        entry_id="mock",
+    )
+    config_entry.add_to_hass(hass)
+    result = await hass.config_entries.options.async_init(config_entry.entry_id)
+
+    for path in ("signals.json", str(tmp_path / "missing" / "signals.json"), str(tmp_path)):
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"], user_input={OPTION_SHARED_CACHE_PATH: path}
+        )
+        assert result["type"] == FlowResultType.FORM
+        assert result["errors"] == {OPTION_SHARED_CACHE_PATH: "invalid_shared_cache_path"}
+
+    path = str(tmp_path / "signals.json")
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input={OPTION_SHARED_CACHE_PATH: path}
+    )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert config_entry.options[OPTION_SHARED_CACHE_PATH] == path
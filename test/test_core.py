@@ -0,0 +1,115 @@
+"""Test for the RTE Jours Signalés Home Assistant free core and its command line."""
+
+import json
+import subprocess
+import sys
+from unittest.mock import patch
+
+from oauthlib.oauth2.rfc6749.errors import InvalidClientError
+
+from custom_components.rte_jours_signales.core.__main__ import main
+from .test_worker import MOCK_PAYLOAD
+
+# Cold import time of the core, in microseconds: it measures about 150ms, importing
+# homeassistant.core alone takes more than 200ms
+CORE_IMPORT_BUDGET = 300_000
+
+
+def import_time(*modules: str) -> dict[str, int]:
+    """Import modules in a new interpreter, returning the self time of every import."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    # import time: self [us] | cumulative | imported package
+    imports = [line.split("|") for line in result.stderr.splitlines()[1:]]
+    return {
+        module.strip(): int(self_time.split(":")[1]) for self_time, _, module in imports
+    }
+
+
+def test_core_import():
+    """Test that the core imports neither Home Assistant nor its dependencies."""
+    imports = import_time(
+        "custom_components.rte_jours_signales.core.worker",
+        "custom_components.rte_jours_signales.core.__main__",
+    )
+
+    assert not {
+        module
+        for module in imports
+        if module.split(".")[0] in ("homeassistant", "aiohttp", "voluptuous")
+    }
+    total = sum(imports.values())
+    assert total < CORE_IMPORT_BUDGET, f"core imported in {total / 1000:.0f}ms"
+
+
+def test_command_line_import():
+    """Test that the offline commands do not import the RTE client dependencies."""
+    imports = import_time("custom_components.rte_jours_signales.core.__main__")
+
+    assert not {
+        module
+        for module in imports
+        if module.split(".")[0] in ("requests", "oauthlib", "requests_oauthlib", "fcntl")
+    }
+
+
+def test_fetch_invalid_client(monkeypatch, capsys):
+    """Test that fetch reports rejected credentials."""
+    monkeypatch.setenv("RTE_CLIENT_ID", "my-client-id")
+    monkeypatch.setenv("RTE_CLIENT_SECRET", "my-client-secret")
+    with patch(
+        "custom_components.rte_jours_signales.core.client.OAuth2Session.fetch_token",
+        side_effect=InvalidClientError(),
+    ):
+        assert main(["fetch"]) == 1
+
+    assert capsys.readouterr().err.startswith("error: (invalid_client)")
+
+
+def test_dump(tmp_path, capsys):
+    """Test that dump prints the validated days and the errors of a payload."""
+    payload = tmp_path / "payload.json"
+    payload.write_text(json.dumps(MOCK_PAYLOAD))
+
+    assert main(["dump", str(payload)]) == 0
+
+    output = json.loads(capsys.readouterr().out)
+    assert [day["start"] for day in output["signals"]["0"]] == [
+        "2025-01-01T00:00:00+01:00",
+        "2025-01-02T00:00:00+01:00",
+    ]
+    assert output["errors"] == []
+    # Unreadable payloads are reported, not raised
+    payload.write_text("{")
+    assert main(["dump", str(payload)]) == 1
+    assert main(["dump", str(tmp_path / "missing.json")]) == 1
+
+
+def test_replay(tmp_path, capsys):
+    """Test that replay runs a worker cycle against a saved payload."""
+    payload = tmp_path / "payload.json"
+    payload.write_text(json.dumps(MOCK_PAYLOAD))
+
+    assert main(["replay", str(payload), "--at", "2025-01-01T11:00"]) == 0
+
+    output = json.loads(capsys.readouterr().out)
+    assert output["at"] == "2025-01-01T11:00:00+01:00"
+    assert output["signals"]["0"]["current"]["value"] == 1
+    assert output["signals"]["0"]["next"]["start"] == "2025-01-02T00:00:00+01:00"
+    assert output["wait"] > 0
+
+
+def test_bench(tmp_path, capsys):
+    """Test that bench times the decoding and the validation of a payload."""
+    payload = tmp_path / "payload.json"
+    payload.write_text(json.dumps(MOCK_PAYLOAD))
+
+    assert main(["bench", str(payload), "-n", "10"]) == 0
+
+    output = json.loads(capsys.readouterr().out)
+    assert output["iterations"] == 10
+    assert set(output["decode_us"]) == set(output["validate_us"]) == {"mean", "median", "min"}
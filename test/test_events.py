@@ -0,0 +1,95 @@
+"""Test for the RTE Jours Signalés integration signal day events."""
+
+import datetime
+from unittest.mock import Mock
+
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    async_capture_events,
+    async_fire_time_changed,
+)
+
+from custom_components.rte_jours_signales.core.signals import SignalDay, SignalIndex
+from custom_components.rte_jours_signales.const import (
+    EVENT_SIGNAL_END,
+    EVENT_SIGNAL_START,
+    FRANCE_TZ,
+)
+from custom_components.rte_jours_signales.events import (
+    SignalEventScheduler,
+    parse_lead_times,
+)
+
+
+def signal_day(start: datetime.datetime, value: int) -> SignalDay:
+    """Build a signal day starting at the given datetime."""
+    return SignalDay(
+        Start=start,
+        End=start + datetime.timedelta(days=1),
+        Value=value,
+        Updated=start - datetime.timedelta(hours=12),
+    )
+
+
+async def test_signal_events(anyio_backend, hass, freezer):
+    """Test that the events fire at their lead times and follow the signal days changes."""
+    # Early enough in the day for every lead time of tomorrow to be ahead
+    freezer.move_to(datetime.datetime(2025, 1, 1, 12, 0, tzinfo=FRANCE_TZ))
+    tomorrow = datetime.datetime(2025, 1, 2, tzinfo=FRANCE_TZ)
+    day_after = tomorrow + datetime.timedelta(days=1)
+    api_worker = Mock()
+    api_worker.get_signals.return_value = {
+        0: SignalIndex.from_days([signal_day(tomorrow, 1), signal_day(day_after, 0)])
+    }
+    start_events = async_capture_events(hass, EVENT_SIGNAL_START)
+    end_events = async_capture_events(hass, EVENT_SIGNAL_END)
+    scheduler = SignalEventScheduler(hass, "mock", api_worker, [120, 0])
+
+    scheduler.async_update()
+
+    # Two start events and an end event, none for the not reported day
+    assert len(scheduler._timers) == 3
+    freezer.move_to(tomorrow - datetime.timedelta(hours=2))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert [event.data["lead_time"] for event in start_events] == [120]
+    assert start_events[0].data["value"] == "explicit"
+    assert start_events[0].data["start"] == tomorrow.isoformat()
+    assert len(scheduler._timers) == 2
+
+    # Only the changed day is rescheduled
+    end_timer = next(
+        cancel for key, cancel in scheduler._timers.items() if key[1] == EVENT_SIGNAL_END
+    )
+    api_worker.get_signals.return_value = {
+        0: SignalIndex.from_days([signal_day(tomorrow, 1), signal_day(day_after, 2)])
+    }
+    scheduler.async_update()
+    assert len(scheduler._timers) == 5
+    assert end_timer in scheduler._timers.values()
+
+    freezer.move_to(day_after)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert sorted(
+        (event.data["start"], event.data["lead_time"], event.data["value"])
+        for event in start_events[1:]
+    ) == [
+        (tomorrow.isoformat(), 0, "explicit"),
+        (day_after.isoformat(), 0, "implicit"),
+        (day_after.isoformat(), 120, "implicit"),
+    ]
+    assert len(end_events) == 1
+    assert "lead_time" not in end_events[0].data
+
+    scheduler.async_cancel()
+    assert scheduler._timers == {}
+
+
+def test_parse_lead_times():
+    """Test the lead times option parsing."""
+    assert parse_lead_times("120, 0,30,120") == [0, 30, 120]
+    assert parse_lead_times("") == []
+    for lead_times in ("-5", "two hours"):
+        with pytest.raises(ValueError):
+            parse_lead_times(lead_times)
@@ -0,0 +1,66 @@
+"""Test for the RTE Jours Signalés integration HTTP export."""
+
+from aiohttp.test_utils import make_mocked_request
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.rte_jours_signales.const import (
+    DOMAIN,
+    CONFIG_CLIEND_SECRET,
+    CONFIG_CLIENT_ID,
+)
+from custom_components.rte_jours_signales.export import SignalExportView
+from .const import MOCK_CLIENT_ID, MOCK_CLIENT_SECRET
+
+
+async def test_export(
+    anyio_backend,
+    hass,
+    mock_get_signals,
+    mock_get_access_token,
+    mock_update_signal_days,
+):
+    """Test the JSON and iCalendar exports and their ETags."""
+    # create a mock config entry to bypass the config flow
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONFIG_CLIENT_ID: MOCK_CLIENT_ID, CONFIG_CLIEND_SECRET: MOCK_CLIENT_SECRET},
+        options={},
+        entry_id="mock",
+    )
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    view = SignalExportView(hass)
+    assert view.requires_auth
+
+    # JSON export of every signal day
+    request = make_mocked_request("GET", f"/api/{DOMAIN}/mock/signals.json")
+    response = await view.get(request, "mock", "json")
+    assert response.status == 200
+    assert response.content_type == "application/json"
+    assert b'"name": "explicit"' in response.body
+    etag = response.headers["ETag"]
+
+    # Repeated request with the ETag only gets a 304
+    request = make_mocked_request(
+        "GET", f"/api/{DOMAIN}/mock/signals.json", headers={"If-None-Match": etag}
+    )
+    response = await view.get(request, "mock", "json")
+    assert response.status == 304
+    assert response.headers["ETag"] == etag
+
+    # iCalendar export of the signaled days only
+    request = make_mocked_request("GET", f"/api/{DOMAIN}/mock/signals.ics")
+    response = await view.get(request, "mock", "ics")
+    assert response.status == 200
+    assert response.content_type == "text/calendar"
+    assert response.body.count(b"BEGIN:VEVENT") == 1
+    assert b"DTSTART;VALUE=DATE:20250101" in response.body
+
+    # Unknown entries and formats
+    assert (await view.get(request, "other", "json")).status == 404
+    assert (await view.get(request, "mock", "xml")).status == 404
+
+    # The export goes away with its entry
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    assert (await view.get(request, "mock", "json")).status == 404
@@ -0,0 +1,77 @@
+"""Test for the RTE Jours Signalés integration setup and unload."""
+
+from unittest.mock import patch
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.config_entries import ConfigEntryState
+
+from custom_components.rte_jours_signales.const import (
+    DOMAIN,
+    CONFIG_CLIEND_SECRET,
+    CONFIG_CLIENT_ID,
+)
+from custom_components.rte_jours_signales.core.worker import APIWorker
+from custom_components.rte_jours_signales.export import SignalExportView
+from .const import MOCK_CLIENT_ID, MOCK_CLIENT_SECRET
+
+
+async def test_unload_worker_still_running(
+    anyio_backend,
+    hass,
+    mock_get_signals,
+    mock_get_access_token,
+    mock_update_signal_days,
+):
+    """Test that the unload fails, and no reload happens, while the worker runs."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONFIG_CLIENT_ID: MOCK_CLIENT_ID, CONFIG_CLIEND_SECRET: MOCK_CLIENT_SECRET},
+        options={},
+        entry_id="mock",
+    )
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    with (
+        patch.object(APIWorker, "is_alive", return_value=True),
+        patch.object(APIWorker, "start") as start,
+    ):
+        assert not await hass.config_entries.async_reload(config_entry.entry_id)
+    start.assert_not_called()
+    assert config_entry.entry_id not in hass.data[DOMAIN]
+
+    # Once stopped, the entry unloads as usual
+    config_entry.mock_state(hass, ConfigEntryState.NOT_LOADED)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    assert config_entry.state is ConfigEntryState.NOT_LOADED
+
+
+async def test_export_view_registered_once(
+    anyio_backend,
+    hass,
+    mock_get_signals,
+    mock_get_access_token,
+    mock_update_signal_days,
+):
+    """Test that the HTTP export view is registered with the first entry only."""
+    for entry_id, client_id in (("first", MOCK_CLIENT_ID), ("second", "other-client-id")):
+        config_entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={CONFIG_CLIENT_ID: client_id, CONFIG_CLIEND_SECRET: MOCK_CLIENT_SECRET},
+            options={},
+            entry_id=entry_id,
+        )
+        config_entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    routes = [
+        route
+        for route in hass.http.app.router.routes()
+        if route.resource.canonical == SignalExportView.url and route.method == "GET"
+    ]
+    assert len(routes) == 1
@@ -4,19 +4,21 @@ from unittest.mock import patch
 import datetime
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.rte_jours_signales import async_setup_entry
+from homeassistant.helpers.entity_component import async_update_entity
+
+from custom_components.rte_jours_signales.core.worker import SignalsFreshness
 from custom_components.rte_jours_signales.const import (
     DOMAIN,
     CONFIG_CLIEND_SECRET,
     CONFIG_CLIENT_ID,
     FRANCE_TZ,
 )
-from .const import MOCK_CLIENT_ID, MOCK_CLIENT_SECRET
+from .const import MOCK_CLIENT_ID, MOCK_CLIENT_SECRET, MOCK_SIGNALS
 
 async def test_sensors_unknown(
     anyio_backend,
     hass,
-    mock_get_signal_days,
+    mock_get_signals,
     mock_get_access_token,
     mock_update_signal_days,
 ):
@@ -31,7 +33,7 @@ async def test_sensors_unknown(
     config_entry.add_to_hass(hass)
 
     # setup the entry
-    assert await async_setup_entry(hass, config_entry)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
     await hass.async_block_till_done()
 
     # current sensor should be created
@@ -49,7 +51,7 @@ async def test_sensors(
     current_datetime,
     anyio_backend,
     hass,
-    mock_get_signal_days,
+    mock_get_signals,
     mock_get_access_token,
     mock_update_signal_days,
 ):
@@ -66,7 +68,7 @@ async def test_sensors(
     config_entry.add_to_hass(hass)
 
     # setup the entry
-    assert await async_setup_entry(hass, config_entry)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
     await hass.async_block_till_done()
 
     # current sensor should be created
@@ -78,3 +80,134 @@ async def test_sensors(
     state_next = hass.states.get("sensor.rte_jours_signales_signal_next")
     assert state_next
     assert state_next.state == "not_reported"
+
+
+@patch("custom_components.rte_jours_signales.sensor._current_datetime")
+async def test_sensors_every_signal(
+    current_datetime,
+    anyio_backend,
+    hass,
+    mock_get_signals,
+    mock_get_access_token,
+    mock_update_signal_days,
+):
+    """Test that sensors are created for each signal."""
+    current_datetime.return_value = datetime.datetime(year=2025, month=1, day=1, hour=13, minute=37, second=0, tzinfo=FRANCE_TZ)
+    mock_get_signals.return_value = {0: MOCK_SIGNALS[0], 1: MOCK_SIGNALS[0]}
+
+    # create a mock config entry to bypass the config flow
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONFIG_CLIENT_ID: MOCK_CLIENT_ID, CONFIG_CLIEND_SECRET: MOCK_CLIENT_SECRET},
+        options={},
+        entry_id="mock",
+    )
+    config_entry.add_to_hass(hass)
+
+    # setup the entry
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    # main signal sensors keep their entity ids
+    assert hass.states.get("sensor.rte_jours_signales_signal_current").state == "explicit"
+    assert hass.states.get("sensor.rte_jours_signales_signal_next").state == "not_reported"
+
+    # other signal sensors should be created
+    state_current = hass.states.get("sensor.rte_jours_signales_signal_1_current")
+    assert state_current
+    assert state_current.state == "explicit"
+    state_next = hass.states.get("sensor.rte_jours_signales_signal_1_next")
+    assert state_next
+    assert state_next.state == "not_reported"
+
+
+@patch("custom_components.rte_jours_signales.sensor._current_datetime")
+async def test_sensors_new_signal(
+    current_datetime,
+    anyio_backend,
+    hass,
+    mock_get_signals,
+    mock_get_access_token,
+    mock_update_signal_days,
+):
+    """Test that sensors are created for a signal showing up after setup."""
+    current_datetime.return_value = datetime.datetime(year=2025, month=1, day=1, hour=13, minute=37, second=0, tzinfo=FRANCE_TZ)
+
+    # create a mock config entry to bypass the config flow
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONFIG_CLIENT_ID: MOCK_CLIENT_ID, CONFIG_CLIEND_SECRET: MOCK_CLIENT_SECRET},
+        options={},
+        entry_id="mock",
+    )
+    config_entry.add_to_hass(hass)
+
+    # setup the entry
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.rte_jours_signales_signal_1_current") is None
+
+    # a new signal shows up, the worker notifies its listeners from its thread
+    mock_get_signals.return_value = {0: MOCK_SIGNALS[0], 1: MOCK_SIGNALS[0]}
+    api_worker = hass.data[DOMAIN][config_entry.entry_id]
+    await hass.async_add_executor_job(lambda: [listener() for listener in api_worker._listeners])
+    await hass.async_block_till_done()
+
+    # the new signal sensors should be created
+    state_current = hass.states.get("sensor.rte_jours_signales_signal_1_current")
+    assert state_current
+    assert state_current.state == "explicit"
+    state_next = hass.states.get("sensor.rte_jours_signales_signal_1_next")
+    assert state_next
+    assert state_next.state == "not_reported"
+
+@patch("custom_components.rte_jours_signales.core.worker.APIWorker.get_freshness")
+async def test_sensors_freshness(
+    get_freshness,
+    anyio_backend,
+    hass,
+    mock_get_signals,
+    mock_get_access_token,
+    mock_update_signal_days,
+):
+    """Test the freshness sensors, and the signal sensors once the data is stale."""
+    fetched = datetime.datetime.now(FRANCE_TZ) - datetime.timedelta(hours=30)
+    updated = datetime.datetime(year=2025, month=1, day=2, hour=0, minute=0, second=0, tzinfo=FRANCE_TZ)
+    next_fetch = fetched + datetime.timedelta(minutes=10)
+    get_freshness.return_value = SignalsFreshness(
+        Fetched=fetched, Updated=updated, NextFetch=next_fetch
+    )
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONFIG_CLIENT_ID: MOCK_CLIENT_ID, CONFIG_CLIEND_SECRET: MOCK_CLIENT_SECRET},
+        options={},
+        entry_id="mock",
+    )
+    config_entry.add_to_hass(hass)
+
+    # setup the entry
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    # freshness sensors should be created from the worker metadata
+    last_fetch = hass.states.get("sensor.rte_jours_signales_last_fetch")
+    assert datetime.datetime.fromisoformat(last_fetch.state) == fetched.replace(microsecond=0)
+    data_updated = hass.states.get("sensor.rte_jours_signales_data_updated")
+    assert datetime.datetime.fromisoformat(data_updated.state) == updated
+    assert data_updated.attributes["updated_dates"]["0"] == {
+        "2025-01-01": "2025-01-02T00:00:00+01:00",
+        "2025-01-02": "2025-01-03T00:00:00+01:00",
+    }
+    assert hass.states.get("sensor.rte_jours_signales_data_age").state == "1800"
+    next_fetch_state = hass.states.get("sensor.rte_jours_signales_next_fetch")
+    assert datetime.datetime.fromisoformat(next_fetch_state.state) == next_fetch.replace(microsecond=0)
+
+    # data older than the default max age (24 hours)
+    assert hass.states.get("sensor.rte_jours_signales_signal_current").state == "unavailable"
+    assert hass.states.get("sensor.rte_jours_signales_signal_next").state == "unavailable"
+
+    # disabling the max age makes them available again
+    hass.config_entries.async_update_entry(config_entry, options={"max_data_age": 0})
+    await hass.async_block_till_done()
+    await async_update_entity(hass, "sensor.rte_jours_signales_signal_current")
+    assert hass.states.get("sensor.rte_jours_signales_signal_current").state != "unavailable"
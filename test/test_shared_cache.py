@@ -0,0 +1,118 @@
+"""Test for the RTE Jours Signalés integration shared cache."""
+
+import datetime
+import errno
+import multiprocessing
+import os
+from unittest.mock import patch
+
+from custom_components.rte_jours_signales.const import FRANCE_TZ, SHARED_CACHE_POLL
+from custom_components.rte_jours_signales.core.shared_cache import SharedCache
+from custom_components.rte_jours_signales.core.worker import APIWorker
+from .const import MOCK_CLIENT_ID, MOCK_CLIENT_SECRET, MOCK_SIGNALS
+from .test_worker import MOCK_PAYLOAD, mock_response
+
+LEASE = datetime.timedelta(minutes=5)
+
+
+def acquire_lease(path: str, barrier) -> None:
+    """Race for the lease in a separate process, exiting with 0 if it was won."""
+    barrier.wait()
+    os._exit(0 if SharedCache(path).acquire(LEASE) else 1)
+
+
+def test_lease_single_holder(tmp_path):
+    """Test that only one process of the host gets the lease."""
+    path = str(tmp_path / "signals.json")
+    context = multiprocessing.get_context("fork")
+    barrier = context.Barrier(8)
+    processes = [
+        context.Process(target=acquire_lease, args=(path, barrier)) for _ in range(8)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(10)
+
+    assert sorted(process.exitcode for process in processes) == [0] + [1] * 7
+    # The holder lives in another process, so the lease is still taken
+    assert not SharedCache(path).acquire(LEASE)
+
+
+def test_lease_takeover(tmp_path):
+    """Test that the lease can be renewed by its holder and taken over once expired."""
+    path = str(tmp_path / "signals.json")
+    holder = SharedCache(path, owner="holder")
+    follower = SharedCache(path, owner="follower")
+
+    assert holder.acquire(LEASE)
+    assert holder.acquire(LEASE)
+    assert not follower.acquire(LEASE)
+    with patch("time.time", return_value=datetime.datetime.now().timestamp() + 600):
+        assert follower.acquire(LEASE)
+        assert not holder.acquire(LEASE)
+
+
+def test_snapshot(tmp_path):
+    """Test that a snapshot is read back as written, only once per change."""
+    path = str(tmp_path / "signals.json")
+    fetched = datetime.datetime(2025, 1, 1, 10, 0, tzinfo=FRANCE_TZ)
+    reader = SharedCache(path)
+    assert reader.read() is None
+
+    SharedCache(path).write(MOCK_SIGNALS, fetched)
+
+    snapshot = reader.read()
+    assert snapshot.Signals == MOCK_SIGNALS
+    assert snapshot.Fetched == fetched
+    assert reader.read() is None
+    # No temporary file left behind
+    assert sorted(os.listdir(tmp_path)) == ["signals.json"]
+
+
+@patch.object(APIWorker, "_get_signal_data", return_value=mock_response(MOCK_PAYLOAD))
+def test_workers_share_one_fetch(get_signal_data, mock_get_access_token, tmp_path):
+    """Test that the lease holder fetches the signals and the other worker loads them."""
+    path = str(tmp_path / "signals.json")
+    leader = APIWorker(MOCK_CLIENT_ID, MOCK_CLIENT_SECRET, shared_cache=SharedCache(path))
+    follower = APIWorker(MOCK_CLIENT_ID, MOCK_CLIENT_SECRET, shared_cache=SharedCache(path))
+    listener_calls = []
+    follower.register_listener(lambda: listener_calls.append(True))
+
+    leader._run_cycle()
+    wait_time = follower._run_cycle()
+
+    assert get_signal_data.call_count == 1
+    assert wait_time == datetime.timedelta(seconds=SHARED_CACHE_POLL)
+    assert follower.get_signals() == leader.get_signals()
+    assert len(listener_calls) == 1
+    # Unchanged snapshot, nothing to load
+    follower._run_cycle()
+    assert get_signal_data.call_count == 1
+    assert len(listener_calls) == 1
+    assert follower.shared_cache_path == path
+
+
+
+@patch.object(APIWorker, "_get_signal_data", return_value=mock_response(MOCK_PAYLOAD))
+def test_unusable_shared_cache(get_signal_data, mock_get_access_token, tmp_path):
+    """Test that a worker whose shared cache cannot be written fetches directly."""
+    # Not a directory, whatever the permissions of the test user
+    (tmp_path / "file").touch()
+    path = str(tmp_path / "file" / "signals.json")
+    api_worker = APIWorker(MOCK_CLIENT_ID, MOCK_CLIENT_SECRET, shared_cache=SharedCache(path))
+
+    wait_time = api_worker._run_cycle()
+
+    assert wait_time != datetime.timedelta(seconds=SHARED_CACHE_POLL)
+    assert len(api_worker.get_signals()[0].Days) == 2
+
+    # A failed snapshot write keeps the fetched signals and leaves no temporary file
+    path = str(tmp_path / "signals.json")
+    api_worker = APIWorker(MOCK_CLIENT_ID, MOCK_CLIENT_SECRET, shared_cache=SharedCache(path))
+    with patch("json.dump", side_effect=OSError(errno.ENOSPC, "No space left on device")):
+        api_worker._run_cycle()
+
+    assert get_signal_data.call_count == 2
+    assert len(api_worker.get_signals()[0].Days) == 2
+    assert sorted(os.listdir(tmp_path)) == ["file", "signals.json.lock"]
@@ -0,0 +1,97 @@
+"""Test for the RTE Jours Signalés integration signals parser."""
+
+import copy
+import datetime
+import logging
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.rte_jours_signales.const import (
+    API_MAX_PAYLOAD_SIZE,
+    API_MAX_SIGNALS,
+    FRANCE_TZ,
+)
+from custom_components.rte_jours_signales.core.signals import (
+    PayloadError,
+    decode_signals_payload,
+    parse_signal_days,
+    validate_signals_payload,
+)
+from .test_worker import MOCK_PAYLOAD
+
+
+def test_parse_every_signal():
+    """Test that every signal of the payload is parsed and indexed."""
+    payload = {"signals": [*MOCK_PAYLOAD["signals"], MOCK_PAYLOAD["signals"][0]]}
+    payload["signals"][1] = {"signaled_dates": payload["signals"][1]["signaled_dates"][:1]}
+
+    signals = parse_signal_days(payload)
+
+    assert list(signals) == [0, 1]
+    assert len(signals[0].Days) == 2
+    assert len(signals[1].Days) == 1
+    # Days are sorted by start date whatever the payload order
+    assert signals[0].Starts == tuple(sorted(signals[0].Starts))
+    localized_now = datetime.datetime(2025, 1, 1, 13, 37, tzinfo=FRANCE_TZ)
+    assert signals[0].current(localized_now).Value == 1
+    assert signals[0].next(localized_now).Value == 0
+    assert signals[1].current(localized_now) is None
+    assert signals[1].next(localized_now).Value == 0
+
+
+def test_validate_signals_payload(caplog):
+    """Test that invalid days are skipped and reported by a single warning."""
+    payload = copy.deepcopy(MOCK_PAYLOAD)
+    signal_days = payload["signals"][0]["signaled_dates"]
+    valid_day = signal_days[0]
+    signal_days += [
+        {**valid_day, "aoe_signals": 7},
+        {**valid_day, "aoe_signals": True},
+        {**valid_day, "start_date": "2025-13-02T00:00:00+01:00"},
+        {**valid_day, "end_date": "2025-01-02"},
+        {**valid_day, "start_date": valid_day["end_date"]},
+        {key: value for key, value in valid_day.items() if key != "updated_date"},
+        "2025-01-02",
+        # Overlaps the first day
+        {
+            **valid_day,
+            "start_date": "2025-01-02T12:00:00+01:00",
+            "end_date": "2025-01-03T12:00:00+01:00",
+        },
+    ]
+
+    validation = validate_signals_payload(payload)
+
+    assert len(validation.Signals[0].Days) == 2
+    assert len(validation.Errors) == 8
+    assert "unknown aoe_signals 7" in validation.Errors[0]
+    assert "overlaps" in validation.Errors[-1]
+    # Same days as the historical strptime parsing
+    assert validation.Signals[0].Days[0].Start == datetime.datetime.strptime(
+        "2025-01-01T00:00:00+0100", "%Y-%m-%dT%H:%M:%S%z"
+    )
+    with caplog.at_level(logging.WARNING):
+        parse_signal_days(payload)
+    assert len(caplog.records) == 1
+
+
+def test_reject_payload():
+    """Test that malformed or huge payloads are rejected before parsing any day."""
+    with patch("json.loads") as loads:
+        with pytest.raises(PayloadError):
+            decode_signals_payload(b" " * (API_MAX_PAYLOAD_SIZE + 1))
+        loads.assert_not_called()
+    with pytest.raises(PayloadError):
+        decode_signals_payload(b"{")
+    for payload in (
+        [],
+        {"signals": {}},
+        {"signals": [{"signaled_dates": None}]},
+        {"signals": MOCK_PAYLOAD["signals"] * (API_MAX_SIGNALS + 1)},
+    ):
+        with patch(
+            "custom_components.rte_jours_signales.core.signals._build_rte_api_datetime"
+        ) as build_datetime, pytest.raises(PayloadError):
+            validate_signals_payload(payload)
+        build_datetime.assert_not_called()
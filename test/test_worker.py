@@ -0,0 +1,262 @@
+"""Test for the RTE Jours Signalés integration API worker."""
+
+import datetime
+import json
+import os
+import socket
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import requests
+
+from custom_components.rte_jours_signales.const import FRANCE_TZ
+from custom_components.rte_jours_signales.core.client import RTEClient
+from custom_components.rte_jours_signales.core.profiling import CycleProfiler
+from custom_components.rte_jours_signales.core.worker import APIWorker, application_tester
+from .const import MOCK_CLIENT_ID, MOCK_CLIENT_SECRET, MOCK_SIGNALS, get_mock_application_seed
+
+MOCK_PAYLOAD = {
+    "signals": [
+        {
+            "signaled_dates": [
+                {
+                    "start_date": "2025-01-02T00:00:00+01:00",
+                    "end_date": "2025-01-03T00:00:00+01:00",
+                    "aoe_signals": 0,
+                    "updated_date": "2025-01-01T10:45:00+01:00",
+                },
+                {
+                    "start_date": "2025-01-01T00:00:00+01:00",
+                    "end_date": "2025-01-02T00:00:00+01:00",
+                    "aoe_signals": 1,
+                    "updated_date": "2024-12-31T10:45:00+01:00",
+                },
+            ]
+        }
+    ]
+}
+
+
+def mock_response(payload) -> requests.Response:
+    """Build a HTTP 200 response holding a JSON payload."""
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(payload).encode()
+    return response
+
+
+@patch.object(APIWorker, "_get_signal_data", return_value=mock_response(MOCK_PAYLOAD))
+def test_profiling(get_signal_data, mock_get_access_token):
+    """Test that the profiler reports every stage and can be removed."""
+    api_worker = APIWorker(MOCK_CLIENT_ID, MOCK_CLIENT_SECRET)
+    records = []
+    api_worker.set_profiler(CycleProfiler(records.append))
+
+    api_worker._run_cycle()
+
+    # One record per cycle, with a span for each stage
+    assert len(records) == 1
+    assert records[0]["cycle"] == 1
+    assert set(records[0]["stages"]) == {
+        "access_token",
+        "signal_data",
+        "json_decode",
+        "parse",
+        "wait_time",
+    }
+    assert len(api_worker.get_signals()[0].Days) == 2
+
+    # Removing the profiler restores the plain methods
+    api_worker.set_profiler(None)
+    assert "_run_cycle" not in api_worker.__dict__
+    assert "_parse_signal_days" not in api_worker.__dict__
+    api_worker._run_cycle()
+    assert len(records) == 1
+
+
+@patch.object(APIWorker, "_get_signal_data", return_value=mock_response(MOCK_PAYLOAD))
+def test_profiling_cprofile_dump(get_signal_data, mock_get_access_token, tmp_path):
+    """Test that a cProfile dump is written after the requested cycles."""
+    api_worker = APIWorker(MOCK_CLIENT_ID, MOCK_CLIENT_SECRET)
+    dump = tmp_path / "worker.prof"
+    api_worker.set_profiler(CycleProfiler(lambda record: None, 2, str(dump)))
+
+    api_worker._run_cycle()
+    assert not dump.exists()
+    api_worker._run_cycle()
+    assert dump.exists()
+
+
+@patch.object(APIWorker, "_get_signal_data", return_value=mock_response(MOCK_PAYLOAD))
+def test_seeded_first_cycle(get_signal_data, mock_get_access_token):
+    """Test that a seeded worker skips the network on its first cycle."""
+    api_worker = APIWorker(MOCK_CLIENT_ID, MOCK_CLIENT_SECRET, seed=get_mock_application_seed())
+    assert api_worker.get_signals() == MOCK_SIGNALS
+
+    api_worker._run_cycle()
+    mock_get_access_token.assert_not_called()
+    get_signal_data.assert_not_called()
+
+    # Next cycles fetch as usual
+    api_worker._run_cycle()
+    get_signal_data.assert_called_once()
+
+
+@patch.object(APIWorker, "_get_signal_data", return_value=mock_response(MOCK_PAYLOAD))
+def test_freshness(get_signal_data, mock_get_access_token):
+    """Test that the freshness metadata follows the fetches and the max data age."""
+    fetched = datetime.datetime(2025, 1, 1, 13, 37, tzinfo=FRANCE_TZ)
+    api_worker = APIWorker(MOCK_CLIENT_ID, MOCK_CLIENT_SECRET, clock=lambda: fetched)
+    assert api_worker.get_freshness().Fetched is None
+    assert not api_worker.is_stale(fetched + datetime.timedelta(days=7))
+
+    api_worker._run_cycle()
+
+    freshness = api_worker.get_freshness()
+    assert freshness.Fetched == fetched
+    assert freshness.Updated == datetime.datetime(2025, 1, 1, 10, 45, tzinfo=FRANCE_TZ)
+    assert not api_worker.is_stale(fetched + datetime.timedelta(days=7))
+    api_worker.set_max_data_age(datetime.timedelta(hours=24))
+    assert not api_worker.is_stale(fetched + datetime.timedelta(hours=23))
+    assert api_worker.is_stale(fetched + datetime.timedelta(hours=25))
+
+
+@patch.object(APIWorker, "_get_signal_data", return_value=mock_response({"signals": None}))
+def test_rejected_payload_keeps_signals(get_signal_data, mock_get_access_token):
+    """Test that the worker keeps its signals when the payload is rejected."""
+    api_worker = APIWorker(MOCK_CLIENT_ID, MOCK_CLIENT_SECRET)
+    api_worker._signals = MOCK_SIGNALS
+
+    assert api_worker._update_signal_days() is None
+    assert api_worker.get_signals() == MOCK_SIGNALS
+
+
+@patch.object(APIWorker, "_get_signal_data", return_value=mock_response(MOCK_PAYLOAD))
+def test_listeners_on_change(get_signal_data, mock_get_access_token):
+    """Test that listeners are only called when the signals change."""
+    api_worker = APIWorker(MOCK_CLIENT_ID, MOCK_CLIENT_SECRET)
+    listener = Mock()
+    remove_listener = api_worker.register_listener(listener)
+
+    api_worker._run_cycle()
+    listener.assert_called_once()
+    api_worker._run_cycle()
+    listener.assert_called_once()
+
+    remove_listener()
+    get_signal_data.return_value = mock_response({"signals": []})
+    api_worker._run_cycle()
+    listener.assert_called_once()
+
+
+def test_shutdown_interrupts_request(socket_enabled, mock_get_access_token):
+    """Test that stopping the worker aborts its in-flight request."""
+    # HTTP server accepting the request and never answering
+    server = socket.create_server(("127.0.0.1", 0))
+    requested = threading.Event()
+
+    def stall():
+        connection, _ = server.accept()
+        connection.recv(4096)
+        requested.set()
+        connection.recv(4096)
+        connection.close()
+
+    threading.Thread(target=stall, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.getsockname()[1]}/signals"
+    with (
+        # OAuth2 refuses plain HTTP, which the local server uses
+        patch.dict(os.environ, {"OAUTHLIB_INSECURE_TRANSPORT": "1"}),
+        patch(
+            "custom_components.rte_jours_signales.core.worker.API_DEMAND_RESPONSE_SIGNAL_ENDPOINT",
+            endpoint,
+        ),
+        patch("custom_components.rte_jours_signales.core.worker.API_REQ_TIMEOUT", 60),
+    ):
+        api_worker = APIWorker(MOCK_CLIENT_ID, MOCK_CLIENT_SECRET)
+        api_worker._client.seed_token({"access_token": "my-access-token", "token_type": "Bearer"})
+        api_worker.start()
+        try:
+            assert requested.wait(5)
+        finally:
+            stop_duration = api_worker.shutdown("test")
+            server.close()
+
+    assert not api_worker.is_alive()
+    assert stop_duration < 1
+
+
+def test_shutdown_interrupts_own_request(socket_enabled, mock_get_access_token):
+    """Test that stopping a worker sharing its client only aborts its own request."""
+    # HTTP server accepting the two requests and never answering
+    server = socket.create_server(("127.0.0.1", 0))
+    connections = []
+    requested = threading.Semaphore(0)
+
+    def stall():
+        for _ in range(2):
+            connection, _ = server.accept()
+            connection.recv(4096)
+            connections.append(connection)
+            requested.release()
+
+    threading.Thread(target=stall, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.getsockname()[1]}/signals"
+    with (
+        patch.dict(os.environ, {"OAUTHLIB_INSECURE_TRANSPORT": "1"}),
+        patch(
+            "custom_components.rte_jours_signales.core.worker.API_DEMAND_RESPONSE_SIGNAL_ENDPOINT",
+            endpoint,
+        ),
+        patch("custom_components.rte_jours_signales.core.worker.API_REQ_TIMEOUT", 60),
+        patch("custom_components.rte_jours_signales.core.client.API_MIN_REQUEST_INTERVAL", 0),
+    ):
+        client = RTEClient.acquire(MOCK_CLIENT_ID, MOCK_CLIENT_SECRET)
+        client.seed_token({"access_token": "my-access-token", "token_type": "Bearer"})
+        stopped = APIWorker(MOCK_CLIENT_ID, MOCK_CLIENT_SECRET, client=client)
+        running = APIWorker(
+            MOCK_CLIENT_ID,
+            MOCK_CLIENT_SECRET,
+            client=RTEClient.acquire(MOCK_CLIENT_ID, MOCK_CLIENT_SECRET),
+        )
+        stopped.start()
+        running.start()
+        try:
+            assert requested.acquire(timeout=5)
+            assert requested.acquire(timeout=5)
+            stop_duration = stopped.shutdown("test")
+            assert not stopped.is_alive()
+            assert stop_duration < 1
+            # The other request is still waiting for its answer
+            time.sleep(0.1)
+            assert running.is_alive()
+            assert not running.get_freshness().Fetched
+        finally:
+            stop_duration = running.shutdown("test")
+            server.close()
+            for connection in connections:
+                connection.close()
+
+    assert not running.is_alive()
+    assert stop_duration < 1
+
+
+@patch("custom_components.rte_jours_signales.core.client.OAuth2Session.fetch_token")
+@patch("custom_components.rte_jours_signales.core.client.OAuth2Session.get")
+def test_application_tester_unexpected_payload(oauth_get, fetch_token, mock_get_access_token):
+    """Test that valid credentials returning an unexpected payload still validate."""
+    oauth_get.return_value = mock_response({"unexpected": []})
+
+    seed = application_tester(MOCK_CLIENT_ID, MOCK_CLIENT_SECRET)
+
+    fetch_token.assert_called_once()
+    assert seed.Signals is None
+
+    # The worker keeps the token but fetches the signals on its first cycle
+    with patch.object(
+        APIWorker, "_get_signal_data", return_value=mock_response(MOCK_PAYLOAD)
+    ) as get_signal_data:
+        api_worker = APIWorker(MOCK_CLIENT_ID, MOCK_CLIENT_SECRET, seed=seed)
+        api_worker._run_cycle()
+        get_signal_data.assert_called_once()